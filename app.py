@@ -9,7 +9,13 @@ NAVBAR_STYLE = {
     "padding": "15px 10px"
 }
 
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], use_pages=True)
+# Dataset pages are generated on first visit, so callback ids are not
+# validated against the (lazy) page layouts.
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], use_pages=True,
+                suppress_callback_exceptions=True)
+
+# Register the dataset pages (see datasets.py).
+from datasets import DATASETS
 
 header = html.Header(
     html.Div(
@@ -58,8 +64,8 @@ header = html.Header(
 tabs_container = html.Div(
     dbc.Nav(
         [
-            dbc.NavLink("All solutions", href="/", active="exact", className="grouped-nav-link"),
-            dbc.NavLink("Optimized", href="/legofit2", active="exact", className="grouped-nav-link"),
+            dbc.NavLink(dataset.title, href=dataset.path, active="exact", className="grouped-nav-link")
+            for dataset in DATASETS.values()
         ],
         pills=True,
         className="tabs-group"  # container for grouped links
@@ -76,12 +82,27 @@ app.layout = dbc.Container([
     combined_header,
     # Provide the current URL so callbacks can detect the page.
     dcc.Location(id="url", refresh=False),
+    # link to the current selection, kept in step with the address bar
+    dcc.Store(id="shared-link"),
     dash.page_container,
 ], fluid=True)
 
 # Import callback files .
 import callbacks
-import callbacks_legofit2
+
+# Streamed CSV/Parquet export of the selected designs.
+from export import add_export_route
+add_export_route(app)
+
+# Per-callback timing and payload sizes, served at /metrics.
+from metrics import instrument
+instrument(app)
+
+# Gzip layout and callback responses. Flask runs after_request hooks in
+# reverse order, so this runs before the metrics hook and /metrics records
+# the bytes actually sent.
+from typed_arrays import compress_responses
+compress_responses(app)
 
 server = app.server
 
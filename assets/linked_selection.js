@@ -0,0 +1,398 @@
+// Linked selection in the browser. Mapping a click, a box select or a table
+// row select to row positions only needs data the page already holds
+// (scatter customdata, parcoords values, the rows of the current table
+// page), so it runs here instead of waiting for a server worker. Selections
+// that need the full DataFrame are handed to the server through the
+// selection-request store (see callbacks.py). Rows appended to a streaming
+// dataset arrive as plain columns and are concatenated onto the figures here.
+// The selection itself travels as a compact token (encodeSelection) that is
+// mirrored into the page URL (replacing the history entry, so Back leaves
+// the page rather than stepping through selections), so the link reopens
+// the same selection.
+(function () {
+    var TYPED_ARRAYS = {
+        f8: Float64Array, f4: Float32Array,
+        i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+        i4: Int32Array, u4: Uint32Array, i8: BigInt64Array, u8: BigUint64Array
+    };
+    var decoded = new WeakMap();
+    var positions = new WeakMap();
+
+    // plotly sends numpy arrays as {dtype, bdata, shape}; return a flat array
+    function decode(values) {
+        if (!values) {
+            return [];
+        }
+        if (Array.isArray(values)) {
+            return values;
+        }
+        if (!decoded.has(values)) {
+            var binary = atob(values.bdata);
+            var bytes = new Uint8Array(binary.length);
+            for (var i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            decoded.set(values, Array.from(new TYPED_ARRAYS[values.dtype](bytes.buffer), Number));
+        }
+        return decoded.get(values);
+    }
+
+    // row position -> index of the drawn scatter point (customdata[-1])
+    function rowPositions(customdata) {
+        if (!customdata) {
+            return null;
+        }
+        if (!positions.has(customdata)) {
+            var map = new Map();
+            if (Array.isArray(customdata)) {
+                customdata.forEach(function (item, i) {
+                    map.set(Number(item[item.length - 1]), i);
+                });
+            } else {
+                var flat = decode(customdata);
+                var width = customdata.shape ? Number(String(customdata.shape).split(",")[1]) : 1;
+                for (var i = 0; i * width < flat.length; i++) {
+                    map.set(flat[i * width + width - 1], i);
+                }
+            }
+            positions.set(customdata, map);
+        }
+        return positions.get(customdata);
+    }
+
+    // customdata as an array of [id, row] pairs
+    function customdataPairs(customdata) {
+        if (!customdata || Array.isArray(customdata)) {
+            return customdata || [];
+        }
+        var flat = decode(customdata);
+        var width = customdata.shape ? Number(String(customdata.shape).split(",")[1]) : 1;
+        var pairs = [];
+        for (var i = 0; i * width < flat.length; i++) {
+            pairs.push(flat.slice(i * width, (i + 1) * width));
+        }
+        return pairs;
+    }
+
+    // Selection tokens (see selection.py): "" for no rows, "b" + a packed
+    // bitset or "d" + varint gaps between the sorted rows, in URL-safe base64.
+    var lastToken = {token: "", rows: []};
+
+    function toUrlsafe(bytes) {
+        var binary = "";
+        for (var i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        return btoa(binary).replace(/\+/g, "-").replace(/\//g, "_").replace(/=+$/, "");
+    }
+
+    function fromUrlsafe(text) {
+        var binary = atob(text.replace(/-/g, "+").replace(/_/g, "/") + "===".slice((text.length + 3) % 4));
+        var bytes = new Uint8Array(binary.length);
+        for (var i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return bytes;
+    }
+
+    function encodeSelection(rows) {
+        var sorted = Array.from(new Set(rows)).sort(function (a, b) {
+            return a - b;
+        });
+        if (!sorted.length) {
+            return "";
+        }
+        var gaps = [];
+        var previous = -1;
+        sorted.forEach(function (row) {
+            var gap = row - previous - 1;
+            while (gap >= 128) {
+                gaps.push(gap % 128 + 128);
+                gap = Math.floor(gap / 128);
+            }
+            gaps.push(gap);
+            previous = row;
+        });
+        var last = sorted[sorted.length - 1];
+        if (gaps.length <= Math.floor(last / 8) + 1) {
+            return "d" + toUrlsafe(Uint8Array.from(gaps));
+        }
+        var bits = new Uint8Array(Math.floor(last / 8) + 1);
+        sorted.forEach(function (row) {
+            bits[Math.floor(row / 8)] |= 1 << (row % 8);
+        });
+        return "b" + toUrlsafe(bits);
+    }
+
+    function decodeSelection(token) {
+        if (!token) {
+            return [];
+        }
+        if (token !== lastToken.token) {
+            var bytes = fromUrlsafe(token.slice(1));
+            var rows = [];
+            var i;
+            if (token[0] === "b") {
+                for (i = 0; i < bytes.length * 8; i++) {
+                    if (bytes[Math.floor(i / 8)] & (1 << (i % 8))) {
+                        rows.push(i);
+                    }
+                }
+            } else {
+                var row = -1, gap = 0, scale = 1;
+                for (i = 0; i < bytes.length; i++) {
+                    gap += (bytes[i] & 0x7f) * scale;
+                    scale *= 128;
+                    if (bytes[i] < 0x80) {
+                        row += gap + 1;
+                        rows.push(row);
+                        gap = 0;
+                        scale = 1;
+                    }
+                }
+            }
+            lastToken = {token: token, rows: rows};
+        }
+        return lastToken.rows;
+    }
+
+    function pointRows(points) {
+        var rows = points.map(function (pt) {
+            return pt.customdata ? Number(pt.customdata[pt.customdata.length - 1]) : pt.pointIndex;
+        });
+        return Array.from(new Set(rows));
+    }
+
+    function sameRows(a, b) {
+        var left = new Set(a || []);
+        var right = new Set(b || []);
+        if (left.size !== right.size) {
+            return false;
+        }
+        for (var row of left) {
+            if (!right.has(row)) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    // the sorted distinct values merged into at most `limit` ranges, split at
+    // the widest gaps (covering_ranges in selection.py)
+    function coveringRanges(distinct, limit) {
+        var lows = distinct, highs = distinct;
+        if (distinct.length > limit) {
+            var cuts = distinct.slice(1).map(function (value, i) {
+                return i;
+            }).sort(function (a, b) {
+                return (distinct[b + 1] - distinct[b]) - (distinct[a + 1] - distinct[a]);
+            }).slice(0, limit - 1).sort(function (a, b) {
+                return a - b;
+            });
+            lows = [distinct[0]].concat(cuts.map(function (i) {
+                return distinct[i + 1];
+            }));
+            highs = cuts.map(function (i) {
+                return distinct[i];
+            }).concat([distinct[distinct.length - 1]]);
+        }
+        var pad = function (value) {
+            return value !== 0 ? Math.abs(value) / 100000 : 0.00001;
+        };
+        return lows.map(function (low, i) {
+            return [low - pad(low), highs[i] + pad(highs[i])];
+        });
+    }
+
+    // narrow every parcoords dimension (except the unlinked one) to the rows;
+    // these ranges are not stored as brushes
+    function parallelSelection(figure, rows, linking) {
+        var trace = Object.assign({}, figure.data[0]);
+        trace.dimensions = trace.dimensions.map(function (dimension, i) {
+            dimension = Object.assign({}, dimension);
+            if (i === linking.unlinked_dimension || !rows.length) {
+                dimension.constraintrange = null;
+                return dimension;
+            }
+            var values = decode(dimension.values);
+            var distinct = Array.from(new Set(rows.map(function (row) {
+                return values[row];
+            }).filter(function (value) {
+                return value === value && value !== null;
+            }))).sort(function (a, b) {
+                return a - b;
+            });
+            if (!distinct.length) {
+                dimension.constraintrange = null;
+                return dimension;
+            }
+            dimension.constraintrange = coveringRanges(distinct, linking.selection_ranges);
+            return dimension;
+        });
+        var data = figure.data.slice();
+        data[0] = trace;
+        return Object.assign({}, figure, {data: data});
+    }
+
+    function triggeredProp() {
+        var propId = window.dash_clientside.callback_context.triggered[0].prop_id;
+        var dot = propId.lastIndexOf(".");
+        return JSON.parse(propId.slice(0, dot)).type + "." + propId.slice(dot + 1);
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        linked: {
+            selectFromEvent: function (scatterClick, scatterSelected, parallelClick, parallelSelected,
+                                       tableSelected, selection, pageData, scatterView, parallelFigure,
+                                       linking) {
+                var noUpdate = window.dash_clientside.no_update;
+                var unchanged = [noUpdate, noUpdate, noUpdate, noUpdate];
+                if (!window.dash_clientside.callback_context.triggered.length) {
+                    return unchanged;
+                }
+                var prop = triggeredProp();
+                var density = (scatterView || {}).mode === "density";
+                var request = {prop: prop, resolved: true, time: Date.now()};
+                var rows;
+
+                if (prop === "scatter-plot.selectedData") {
+                    if (!scatterSelected) {
+                        rows = [];
+                    } else if (scatterSelected.range && (linking.downsampled || density)) {
+                        // the box also covers points that were never drawn
+                        request.resolved = false;
+                        return [noUpdate, noUpdate, noUpdate, request];
+                    } else {
+                        rows = pointRows(scatterSelected.points || []);
+                    }
+                } else if (prop === "scatter-plot.clickData") {
+                    if (density) {
+                        // heatmap cells are selected with the box tool
+                        return unchanged;
+                    }
+                    rows = scatterClick && scatterClick.points && scatterClick.points.length
+                        ? pointRows(scatterClick.points.slice(0, 1)) : [];
+                } else if (prop === "parallel-plot.selectedData") {
+                    rows = (parallelSelected && parallelSelected.points || []).map(function (pt) {
+                        return pt.pointIndex;
+                    });
+                } else if (prop === "parallel-plot.clickData") {
+                    rows = parallelClick && parallelClick.points && parallelClick.points.length
+                        ? [parallelClick.points[0].pointIndex] : [];
+                } else if (prop === "data-table.selected_rows") {
+                    // selected_rows only covers the current page; merge it into
+                    // the session selection and stay on the page
+                    var pageIds = (pageData || []).map(function (record) {
+                        return record.id;
+                    });
+                    var onPage = new Set(pageIds);
+                    rows = decodeSelection(selection).filter(function (row) {
+                        return !onPage.has(row);
+                    });
+                    (tableSelected || []).forEach(function (i) {
+                        if (i < pageIds.length) {
+                            rows.push(pageIds[i]);
+                        }
+                    });
+                    if (sameRows(rows, decodeSelection(selection))) {
+                        return unchanged;
+                    }
+                    request = noUpdate;
+                } else {
+                    return unchanged;
+                }
+
+                // a new selection replaces the brushes
+                return [encodeSelection(rows), parallelSelection(parallelFigure, rows, linking), {}, request];
+            },
+
+            highlightSelection: function (selection, scatterFigure, pageData, scatterView, showSelected) {
+                var noUpdate = window.dash_clientside.no_update;
+                var selected = new Set(decodeSelection(selection));
+
+                // selectedpoints are positions in the drawn (possibly downsampled) trace
+                var figure = noUpdate;
+                if ((scatterView || {}).mode !== "density" && scatterFigure && scatterFigure.data.length) {
+                    var trace = Object.assign({}, scatterFigure.data[0]);
+                    var rowToPoint = rowPositions(trace.customdata);
+                    var points = [];
+                    selected.forEach(function (row) {
+                        var point = rowToPoint ? rowToPoint.get(row) : row;
+                        if (point !== undefined) {
+                            points.push(point);
+                        }
+                    });
+                    trace.selectedpoints = selected.size ? points : null;
+                    var data = scatterFigure.data.slice();
+                    data[0] = trace;
+                    figure = Object.assign({}, scatterFigure, {data: data});
+                }
+
+                // with "show selected" the table view itself changes: server side
+                if (showSelected && showSelected.indexOf("show_selected") !== -1) {
+                    return [figure, noUpdate, noUpdate];
+                }
+                var pageSelected = [];
+                var records = (pageData || []).map(function (record, i) {
+                    var flag = selected.has(record.id) ? 1 : 0;
+                    if (flag) {
+                        pageSelected.push(i);
+                    }
+                    return Object.assign({}, record, {_selected: flag});
+                });
+                return [figure, records, pageSelected];
+            },
+
+            // the selection and brushes of the open dataset page as a link query
+            shareSelection: function (selections, constraints) {
+                if (!selections.length) {
+                    return window.dash_clientside.no_update;
+                }
+                var params = new URLSearchParams();
+                if (selections[0]) {
+                    params.set("sel", selections[0]);
+                }
+                var brushes = constraints[0] || {};
+                if (Object.keys(brushes).length) {
+                    params.set("brush", toUrlsafe(new TextEncoder().encode(JSON.stringify(brushes))));
+                }
+                var search = params.toString();
+                var link = window.location.pathname + (search ? "?" + search : "") + window.location.hash;
+                // replace the history entry rather than push one per selection
+                window.history.replaceState(window.history.state, "", link);
+                return window.location.origin + link;
+            },
+
+            appendRows: function (stream, scatterFigure, parallelFigure) {
+                var noUpdate = window.dash_clientside.no_update;
+                if (!stream || !stream.parallel) {
+                    return [noUpdate, noUpdate];
+                }
+                var scatter = noUpdate;
+                if (stream.scatter && scatterFigure && scatterFigure.data.length) {
+                    var trace = Object.assign({}, scatterFigure.data[0]);
+                    trace.x = decode(trace.x).concat(stream.scatter.x);
+                    trace.y = decode(trace.y).concat(stream.scatter.y);
+                    trace.customdata = customdataPairs(trace.customdata).concat(stream.scatter.customdata);
+                    var scatterData = scatterFigure.data.slice();
+                    scatterData[0] = trace;
+                    scatter = Object.assign({}, scatterFigure, {data: scatterData});
+                }
+                var lines = Object.assign({}, parallelFigure.data[0]);
+                lines.dimensions = lines.dimensions.map(function (dimension, i) {
+                    return Object.assign({}, dimension, {
+                        values: decode(dimension.values).concat(stream.parallel.values[i])
+                    });
+                });
+                if (lines.line && lines.line.color && typeof lines.line.color !== "string") {
+                    lines.line = Object.assign({}, lines.line, {
+                        color: decode(lines.line.color).concat(stream.parallel.color)
+                    });
+                }
+                var parallelData = parallelFigure.data.slice();
+                parallelData[0] = lines;
+                return [scatter, Object.assign({}, parallelFigure, {data: parallelData})];
+            }
+        }
+    });
+})();
@@ -0,0 +1,248 @@
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from selection import encode_selection
+from typed_arrays import GZIP_LEVEL
+
+# Benchmark for the selection callbacks. Synthetic datasets with the schema
+# of the 14k simulation sweep are generated at several sizes and registered
+# like the real ones; representative interactions are then replayed through
+# Dash's callback dispatch (no browser), reporting wall time, peak Python
+# memory and response payload bytes for each, both as JSON and as sent
+# (gzipped).
+#
+#   python benchmark.py --sizes 14000 100000 1000000 --repeat 5
+#
+# Caches are written to a private temporary directory, so the first run of
+# every interaction is cold and the following runs are warm.
+SOURCE = "pages/lux_sim14000_ResAll_buildingTotal_shuffled.csv"
+PARAMETERS = ["Transmittance", "shgc", "window_u", "roof_u", "extWall_u"]
+LOADS = ["total_idealCooling", "total_idealHeating"]
+
+
+def synthetic_frame(source, rows, seed=0):
+    # Parameters are drawn over the ranges of the real sweep; loads follow a
+    # linear fit of the real loads plus resampled residuals.
+    real = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    frame = {}
+    for col in PARAMETERS:
+        values = real[col].to_numpy()
+        if pd.api.types.is_integer_dtype(real[col]):
+            frame[col] = rng.choice(np.unique(values), size=rows)
+        else:
+            frame[col] = rng.uniform(values.min(), values.max(), size=rows)
+    design = np.column_stack([real[PARAMETERS].to_numpy(dtype=float), np.ones(len(real))])
+    synthetic = np.column_stack([np.column_stack([frame[col] for col in PARAMETERS]), np.ones(rows)])
+    for col in LOADS:
+        target = real[col].to_numpy(dtype=float)
+        coef = np.linalg.lstsq(design, target, rcond=None)[0]
+        residuals = target - design @ coef
+        frame[col] = synthetic @ coef + rng.choice(residuals, size=rows)
+    return pd.DataFrame(frame, columns=PARAMETERS + LOADS)
+
+
+class Dispatcher:
+    # Builds /_dash-update-component requests for the pattern-matching callbacks.
+    def __init__(self, app):
+        self.client = app.server.test_client()
+        self.callbacks = [d for d in self.client.get("/_dash-dependencies").get_json()
+                          if not d.get("clientside_function")]
+
+    def find(self, trigger):
+        component, prop = trigger.rsplit(".", 1)
+        for dep in self.callbacks:
+            for item in dep["inputs"]:
+                if item["property"] == prop and json.loads(item["id"]).get("type") == component:
+                    return dep
+        raise KeyError(trigger)
+
+    @staticmethod
+    def resolve(dep_id, dataset):
+        dep_id = json.loads(dep_id)
+        return {key: dataset if value == ["MATCH"] else value for key, value in dep_id.items()}
+
+    def payload(self, trigger, values, dataset):
+        dep = self.find(trigger)
+
+        def spec(item):
+            dep_id = self.resolve(item["id"], dataset)
+            key = f'{dep_id["type"]}.{item["property"]}'
+            if ["ALL"] in dep_id.values():
+                return []
+            out = {"id": dep_id, "property": item["property"]}
+            if values.get(key) is not None:
+                out["value"] = values[key]
+            return out
+
+        outputs = []
+        for output in dep["output"][2:-2].split("...") if dep["output"].startswith("..") else [dep["output"]]:
+            dep_id, prop = output.rsplit(".", 1)
+            outputs.append({"id": self.resolve(dep_id.split("@")[0], dataset), "property": prop.split("@")[0]})
+        triggered_id = next(self.resolve(i["id"], dataset) for i in dep["inputs"]
+                            if f'{json.loads(i["id"])["type"]}.{i["property"]}' == trigger)
+        return {
+            "output": dep["output"],
+            "outputs": outputs if dep["output"].startswith("..") else outputs[0],
+            "inputs": [spec(item) for item in dep["inputs"]],
+            "state": [spec(item) for item in dep["state"]],
+            "changedPropIds": [json.dumps(triggered_id, sort_keys=True, separators=(",", ":"))
+                               + "." + trigger.rsplit(".", 1)[1]],
+        }
+
+    def post(self, name, payload):
+        response = self.client.post("/_dash-update-component", json=payload, headers={"Accept-Encoding": "gzip"})
+        if response.status_code not in (200, 204):
+            raise RuntimeError(f"{name}: HTTP {response.status_code}")
+        wire = len(response.data)
+        if response.headers.get("Content-Encoding") == "gzip":
+            return len(gzip.decompress(response.data)), wire
+        return wire, wire
+
+    def page(self, path):
+        # the dash.page_container callback that renders a page's layout
+        return self.post(path, {
+            "output": ".._pages_content.children..._pages_store.data..",
+            "outputs": [{"id": "_pages_content", "property": "children"},
+                        {"id": "_pages_store", "property": "data"}],
+            "inputs": [{"id": "_pages_location", "property": "pathname", "value": path},
+                       {"id": "_pages_location", "property": "search", "value": ""}],
+            "state": [],
+            "changedPropIds": ["_pages_location.pathname"],
+        })
+
+    def __call__(self, trigger, values, dataset):
+        return self.post(trigger, self.payload(trigger, values, dataset))
+
+
+def scenarios(dataset):
+    df = dataset.df
+    n = len(df)
+    view = {"option": "Scatter 1", "mode": "points"}
+    table = {"data-table.page_size": 10, "data-table.page_current": 0, "data-table.filter_query": "",
+             "data-table.sort_by": [], "show-selected-checkbox.value": []}
+    cooling = df["total_idealCooling"].to_numpy()
+    heating = df["total_idealHeating"].to_numpy()
+    x_range = list(np.percentile(cooling, [40, 60]))
+    y_range = list(np.percentile(heating, [40, 60]))
+    box = np.flatnonzero((cooling >= x_range[0]) & (cooling <= x_range[1])
+                         & (heating >= y_range[0]) & (heating <= y_range[1]))
+    selection = encode_selection(np.arange(0, n, 10))
+    shgc = dataset.dimensions_to_plot.index("shgc")
+    window_u = dataset.dimensions_to_plot.index("window_u")
+    shgc_range = list(np.percentile(df["shgc"], [20, 50]))
+    window_range = list(np.percentile(df["window_u"], [30, 70]))
+    return {
+        # clicks are resolved in the browser; the server only finds the page
+        "click": ("selection-request.data", {
+            **table, "scatter-view.data": view, "selection-store.data": encode_selection([n // 2]),
+            "selection-request.data": {"prop": "scatter-plot.clickData", "resolved": True},
+        }),
+        "box select": ("selection-request.data", {
+            **table, "scatter-view.data": view,
+            "scatter-plot.selectedData": {
+                "range": {"x": x_range, "y": y_range},
+                "points": [{"customdata": [int(row), int(row)]} for row in box[:20000]],
+            },
+            "selection-request.data": {"prop": "scatter-plot.selectedData", "resolved": False},
+        }),
+        "multi-axis brush": ("parallel-plot.restyleData", {
+            **table, "scatter-view.data": view,
+            "parallel-constraints.data": {str(shgc): [shgc_range]},
+            "parallel-plot.restyleData": [{f"dimensions[{window_u}].constraintrange": [window_range]}, [0]],
+        }),
+        "select-all": ("select-all-checkbox.value", {
+            **table, "scatter-view.data": view, "data-table.filter_query": "{shgc} > 0.5",
+            "select-all-checkbox.value": ["select_all"],
+        }),
+        "show-selected": ("show-selected-checkbox.value", {
+            **table, "selection-store.data": selection, "show-selected-checkbox.value": ["show_selected"],
+        }),
+        "table page": ("data-table.page_current", {
+            **table, "selection-store.data": selection, "data-table.page_current": 3,
+            "data-table.sort_by": [{"column_id": "total_idealHeating", "direction": "asc"}],
+        }),
+    }
+
+
+def figure_bytes(fig):
+    data = pio.to_json(fig).encode("utf-8")
+    return len(data), len(gzip.compress(data, compresslevel=GZIP_LEVEL))
+
+
+def measure(run, repeat):
+    times = []
+    payload = (0, 0)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = run()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    warm = statistics.median(times[1:]) if len(times) > 1 else times[0]
+    return {"cold_ms": times[0] * 1000, "warm_ms": warm * 1000, "peak_mb": peak / 2 ** 20,
+            "bytes": payload[0], "wire_bytes": payload[1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the selection callbacks on synthetic datasets.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[14000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="graph-bench-")
+    os.environ["DATASET_CACHE_DIR"] = os.path.join(workdir, "datasets")
+    os.environ["RESULT_CACHE_DIR"] = os.path.join(workdir, "results")
+    os.environ["JOB_DIR"] = os.path.join(workdir, "jobs")
+    # time the work itself rather than its hand-off to a background job
+    os.environ["BACKGROUND_ROWS"] = str(2 ** 62)
+    from app import app
+    from datasets import DATASETS, get_dataset, register_dataset
+    from dataset_page import build_scatter_figure, create_scatter_figure
+
+    dispatch = Dispatcher(app)
+    results = []
+    for size in args.sizes:
+        name = f"bench{size}"
+        path = os.path.join(workdir, f"{name}.csv")
+        synthetic_frame(SOURCE, size).to_csv(path, index=False)
+        register_dataset(name, path, path=f"/{name}", title=name,
+                         scatter_options=DATASETS["legofit"].scatter_options, parameters=PARAMETERS,
+                         outputs=DATASETS["legofit"].outputs)
+        start = time.perf_counter()
+        dataset = get_dataset(name)
+        print(f"{name}: loaded {size} rows in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+        runs = {key: (lambda trigger=trigger, values=values: dispatch(trigger, values, name))
+                for key, (trigger, values) in scenarios(dataset).items()}
+        runs["page load"] = lambda: dispatch.page(f"/{name}")
+        runs["build scatter figure"] = lambda: figure_bytes(build_scatter_figure(dataset, "Scatter 1"))
+        runs["create scatter figure"] = lambda: figure_bytes(create_scatter_figure(dataset, "Scatter 1"))
+        for key, run in runs.items():
+            result = {"rows": size, "interaction": key, **measure(run, args.repeat)}
+            results.append(result)
+            print(f'{size:>9} {key:<22} cold {result["cold_ms"]:9.1f} ms  warm {result["warm_ms"]:9.1f} ms  '
+                  f'peak {result["peak_mb"]:8.1f} MB  {result["bytes"]:>10} B  {result["wire_bytes"]:>10} B gzip')
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
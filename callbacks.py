@@ -1,217 +1,531 @@
-from dash import callback, callback_context
-from dash.dependencies import Input, Output, State
-import pandas as pd
+from functools import partial
+
+from dash import callback, callback_context, clientside_callback, no_update, Patch
+from dash.dependencies import Input, Output, State, MATCH, ALL, ClientsideFunction
 from dash.exceptions import PreventUpdate
-import plotly.express as px
 
-# Import variables from legofit.py
-from pages.legofit import df, id_column, labels, scatter_options, create_scatter_figure
+from selection import constraints_from_restyle, restyled_dimensions, encode_selection, decode_selection
+from table_query import table_view, page_count, first_page_of, page_records, query_rows_in_chunks
+from pareto import front_of
+
+import jobs
+import result_cache
+from typed_arrays import typed_array
+from datasets import get_dataset
+from dataset_page import (is_downsampled, is_density, selected_scatter_rows,
+                          scatter_selectedpoints, scatter_trace_data, scatter_view_from_relayout,
+                          scatter_figure, scatter_option_key, scatter_axes, create_density_figure,
+                          pareto_overlay, front_trace_data, PARETO_TRACE, stream_rows, distribution_records, selection_constraints,
+                          create_sensitivity_figure)
+
+
+def match_id(component):
+    # One set of callbacks serves every dataset page through pattern-matching ids.
+    return {"type": component, "dataset": MATCH}
+
+
+def current_dataset():
+    outputs = callback_context.outputs_list
+    output = outputs[0] if isinstance(outputs, list) else outputs
+    return get_dataset(output["id"]["dataset"])
+
+
+# -------------------------------
+# CLIENTSIDE LINKED SELECTION
+# -------------------------------
+# Clicks, box selects and table row selects are mapped to row positions in
+# the browser (assets/linked_selection.js), which also highlights the
+# selection in the scatter, the parallel plot and the current table page.
+# The server is only asked for what needs the full DataFrame: box selects
+# over a downsampled or binned scatter, and the table page to jump to.
+clientside_callback(
+    ClientsideFunction(namespace="linked", function_name="selectFromEvent"),
+    [Output(match_id("selection-store"), "data", allow_duplicate=True),
+     Output(match_id("parallel-plot"), "figure", allow_duplicate=True),
+     Output(match_id("parallel-constraints"), "data", allow_duplicate=True),
+     Output(match_id("selection-request"), "data")],
+    [Input(match_id("scatter-plot"), "clickData"),
+     Input(match_id("scatter-plot"), "selectedData"),
+     Input(match_id("parallel-plot"), "clickData"),
+     Input(match_id("parallel-plot"), "selectedData"),
+     Input(match_id("data-table"), "selected_rows")],
+    [State(match_id("selection-store"), "data"),
+     State(match_id("data-table"), "data"),
+     State(match_id("scatter-view"), "data"),
+     State(match_id("parallel-plot"), "figure"),
+     State(match_id("linking"), "data")],
+    prevent_initial_call=True
+)
+
+clientside_callback(
+    ClientsideFunction(namespace="linked", function_name="highlightSelection"),
+    [Output(match_id("scatter-plot"), "figure", allow_duplicate=True),
+     Output(match_id("data-table"), "data", allow_duplicate=True),
+     Output(match_id("data-table"), "selected_rows", allow_duplicate=True)],
+    Input(match_id("selection-store"), "data"),
+    [State(match_id("scatter-plot"), "figure"),
+     State(match_id("data-table"), "data"),
+     State(match_id("scatter-view"), "data"),
+     State(match_id("show-selected-checkbox"), "value")],
+    prevent_initial_call=True
+)
+
+
+# The selection and brushes are mirrored into the page URL (without a
+# reload, replacing the current history entry), so the address bar is always
+# a link to the current state, also kept in the shared-link store; see
+# Dataset.layout for the other direction.
+clientside_callback(
+    ClientsideFunction(namespace="linked", function_name="shareSelection"),
+    Output("shared-link", "data"),
+    [Input({"type": "selection-store", "dataset": ALL}, "data"),
+     Input({"type": "parallel-constraints", "dataset": ALL}, "data")],
+    prevent_initial_call=True
+)
+
+
+# the export form posts the current selection
+clientside_callback(
+    """
+    function (selection) {
+        return selection || "";
+    }
+    """,
+    Output(match_id("export-selection"), "value"),
+    Input(match_id("selection-store"), "data")
+)
+
 
 # -------------------------------
-# CALLBACK TO UPDATE SCATTER PLOT AND SELECTION
+# CALLBACK TO UPDATE THE SELECTION ON THE SERVER
 # -------------------------------
 @callback(
-    [Output("data-table", "selected_rows"),
-     Output("data-table", "page_current"),
-     Output("data-table", "style_data_conditional"),
-     Output("parallel-plot", "figure"),
-     Output("scatter-plot", "figure")],
-    [Input("scatter-plot", "clickData"),
-     Input("scatter-plot", "selectedData"),
-     Input("parallel-plot", "clickData"),
-     Input("parallel-plot", "selectedData"),
-     Input("data-table", "selected_rows"),
-     Input("select-all-checkbox", "value"),
-     Input("parallel-plot", "restyleData")],
-    [State("parallel-plot", "figure"),
-     State("scatter-plot", "figure"),
-     State("data-table", "derived_virtual_data"),
-     State("data-table", "data")]
+    [Output(match_id("selection-store"), "data"),
+     Output(match_id("data-table"), "page_current"),
+     Output(match_id("parallel-plot"), "figure"),
+     Output(match_id("parallel-constraints"), "data"),
+     Output(match_id("job-store"), "data", allow_duplicate=True)],
+    [Input(match_id("selection-request"), "data"),
+     Input(match_id("select-all-checkbox"), "value"),
+     Input(match_id("parallel-plot"), "restyleData"),
+     Input(match_id("nearest-button"), "n_clicks")],
+    [State(match_id("scatter-plot"), "selectedData"),
+     State(match_id("parallel-constraints"), "data"),
+     State(match_id("selection-store"), "data"),
+     State(match_id("data-table"), "filter_query"),
+     State(match_id("data-table"), "sort_by"),
+     State(match_id("data-table"), "page_size"),
+     State(match_id("show-selected-checkbox"), "value"),
+     State(match_id("scatter-view"), "data"),
+     State({**match_id("nearest-param"), "parameter": ALL}, "value"),
+     State(match_id("nearest-k"), "value"),
+     State(match_id("job-store"), "data")],
+    prevent_initial_call=True
 )
-def update_scatter_and_selection(scatter_click, scatter_selected,
-                                 parallel_click, parallel_selected, table_selected,
-                                 checkbox_values, parallel_restyle, parallel_fig,
-                                 scatter_fig, derived_virtual_data, original_data):
+def update_scatter_and_selection(selection_request, checkbox_values, parallel_restyle, nearest_clicks,
+                                 scatter_selected, constraints, selection, filter_query, sort_by,
+                                 page_size, show_selected, scatter_view, nearest_target, nearest_k, job_state):
     ctx = callback_context
     if not ctx.triggered:
         raise PreventUpdate
 
-    triggered_prop = ctx.triggered[0]["prop_id"]
+    triggered_prop = f'{ctx.triggered_id["type"]}.{ctx.triggered[0]["prop_id"].rsplit(".", 1)[-1]}'
+    dataset = current_dataset()
+    df = dataset.df
+
+    # Branch for selections made in the browser.
+    if "selection-request.data" in triggered_prop:
+        if not selection_request:
+            raise PreventUpdate
+        if selection_request.get("resolved"):
+            # already selected and highlighted; only the table page is left
+            selected_indices = decode_selection(selection, len(df))
+            page_number = selection_page(dataset, selected_indices, filter_query, sort_by, page_size, show_selected)
+            return no_update, page_number, no_update, no_update, drop_job(job_state, "select-all")
+        # a box over a downsampled or binned scatter covers hidden points
+        selected_indices = selected_scatter_rows(dataset, scatter_view, scatter_selected or {})
+        page_number = selection_page(dataset, selected_indices, filter_query, sort_by, page_size, show_selected)
+        return (encode_selection(selected_indices), page_number, select_points_in_parallel(dataset, selected_indices),
+                {}, drop_job(job_state, "select-all"))
 
     # Branch for parallel coordinates range restyleData.
     if "parallel-plot.restyleData" in triggered_prop:
-        label_to_col = {v: k for k, v in labels.items()}
-        dimensions = parallel_fig["data"][0]["dimensions"]
-        constraints_found = False
-        selected_bool = pd.Series(True, index=df.index)
-        for i, dim in enumerate(dimensions):
-            if "constraintrange" in dim and dim["constraintrange"]:
-                constraints_found = True
-                orig_col = label_to_col.get(dim["label"])
-                if orig_col is None:
-                    continue
-                cons = dim["constraintrange"]
-                if isinstance(cons[0], list):
-                    cons = cons[0]
-                lower, upper = cons[0], cons[1]
-                selected_bool &= df[orig_col].between(lower, upper)
-        selected_indices = df.index[selected_bool].tolist() if constraints_found else []
-        page_number = selected_indices[0] // 10 if selected_indices else 0
-        style_data_conditional = []
-        for idx in selected_indices:
-            selected_id = df.iloc[idx][id_column]
-            if isinstance(selected_id, (int, float)):
-                filter_query = f"{{{id_column}}} = {selected_id}"
-            else:
-                filter_query = f"{{{id_column}}} = '{selected_id}'"
-            style_data_conditional.append({
-                "if": {"filter_query": filter_query},
-                "backgroundColor": "#F39C12",
-                "color": "white",
-            })
-        scatter_fig["data"][0]["selectedpoints"] = selected_indices
-        clear_col4 = True
-        if parallel_restyle and isinstance(parallel_restyle, list) and len(parallel_restyle) > 0:
-            changes = parallel_restyle[0]
-            if any("dimensions[3].constraintrange" in key for key in changes.keys()):
-                clear_col4 = False
-        for i, dim in enumerate(dimensions):
-            if i == 3 and clear_col4:
-                dim["constraintrange"] = None
-        return selected_indices, page_number, style_data_conditional, parallel_fig, scatter_fig
+        # the store only holds the user's brushes; ranges drawn for a
+        # selection made elsewhere are dropped when brushing starts
+        constraints = constraints_from_restyle(parallel_restyle, constraints)
+        # every brush on every axis, including several ranges per axis
+        brushes = {dataset.dimensions_to_plot[int(key)]: ranges for key, ranges in constraints.items()}
+        selected_indices = brushed_rows(dataset, brushes) if constraints else []
+        page_number = selection_page(dataset, selected_indices, filter_query, sort_by, page_size, show_selected)
+        if 3 not in restyled_dimensions(parallel_restyle):
+            constraints.pop("3", None)
+        parallel_patch = constraints_patch(dataset, constraints)
+        return (encode_selection(selected_indices), page_number, parallel_patch, constraints,
+                drop_job(job_state, "select-all"))
 
     # Branch for select-all checkbox
     if "select-all-checkbox" in triggered_prop:
         if checkbox_values and "select_all" in checkbox_values:
-            filtered_data = derived_virtual_data if derived_virtual_data is not None else original_data
-            selected_indices = []
-            for i, row in enumerate(original_data):
-                if row in filtered_data:
-                    selected_indices.append(i)
-            page_number = selected_indices[0] // 10 if selected_indices else 0
-            style_data_conditional = []
-            for idx in selected_indices:
-                selected_id = df.iloc[idx][id_column]
-                if isinstance(selected_id, (int, float)):
-                    filter_query = f"{{{id_column}}} = {selected_id}"
-                else:
-                    filter_query = f"{{{id_column}}} = '{selected_id}'"
-                style_data_conditional.append({
-                    "if": {"filter_query": filter_query},
-                    "backgroundColor": "#F39C12",
-                    "color": "white",
-                })
-            label_to_col = {v: k for k, v in labels.items()}
-            dimensions = parallel_fig["data"][0]["dimensions"]
-            for i, dim in enumerate(dimensions):
-                if i == 3:
-                    dim["constraintrange"] = None
-                    continue
-                orig_col = label_to_col.get(dim["label"], None)
-                if orig_col is None:
-                    continue
-                values = df.iloc[selected_indices][orig_col]
-                try:
-                    numeric_values = values.astype(float)
-                    ranges = []
-                    for v in numeric_values:
-                        delta = abs(v) / 100000 if v != 0 else 0.00001
-                        ranges.append([v - delta, v + delta])
-                    dim["constraintrange"] = ranges
-                except Exception:
-                    if not values.empty:
-                        dim["constraintrange"] = [values.iloc[0], values.iloc[0]]
-                    else:
-                        dim["constraintrange"] = None
-            scatter_fig["data"][0]["selectedpoints"] = selected_indices
-            return selected_indices, page_number, style_data_conditional, parallel_fig, scatter_fig
+            if jobs.is_heavy(dataset):
+                # filtered and applied in the background, see poll_jobs
+                compute = partial(select_all_rows, dataset, filter_query, sort_by, page_size, show_selected)
+                return (no_update, no_update, no_update, no_update,
+                        start_job(job_state, "select-all", compute, "Selecting filtered rows", selection))
+            # Filter on the server, the browser only holds the current page.
+            selected_indices = result_cache.cached("filter-rows", dataset, filter_query or "",
+                                                   lambda: table_view(df, filter_query, None).tolist())
+            page_number = selection_page(dataset, selected_indices, filter_query, sort_by, page_size, show_selected)
+            return (encode_selection(selected_indices), page_number,
+                    select_points_in_parallel(dataset, selected_indices), {}, drop_job(job_state, "select-all"))
         else:
-            for dim in parallel_fig["data"][0]["dimensions"]:
-                dim["constraintrange"] = None
-            scatter_fig["data"][0]["selectedpoints"] = []
-            return [], 0, [], parallel_fig, scatter_fig
-
-    # Other selections
-    selected_indices = None
-    if "scatter-plot.selectedData" in triggered_prop:
-        if scatter_selected is None or not scatter_selected.get("points"):
-            selected_indices = []
-        else:
-            selected_indices = [pt["pointIndex"] for pt in scatter_selected.get("points", [])]
-    elif "scatter-plot.clickData" in triggered_prop:
-        if scatter_click is None or not scatter_click.get("points"):
-            selected_indices = []
-        else:
-            selected_indices = [scatter_click["points"][0]["pointIndex"]]
-    elif "parallel-plot.selectedData" in triggered_prop:
-        if parallel_selected is None or not parallel_selected.get("points"):
-            selected_indices = []
-        else:
-            selected_indices = [pt["pointIndex"] for pt in parallel_selected.get("points", [])]
-    elif "parallel-plot.clickData" in triggered_prop:
-        if parallel_click is None or not parallel_click.get("points"):
-            selected_indices = []
-        else:
-            selected_indices = [parallel_click["points"][0]["pointIndex"]]
-    elif "data-table.selected_rows" in triggered_prop:
-        selected_indices = table_selected if table_selected is not None else []
-    else:
-        selected_indices = []
-
-    page_number = selected_indices[0] // 10 if selected_indices else 0
-    style_data_conditional = []
-    for idx in selected_indices:
-        selected_id = df.iloc[idx][id_column]
-        if isinstance(selected_id, (int, float)):
-            filter_query = f"{{{id_column}}} = {selected_id}"
-        else:
-            filter_query = f"{{{id_column}}} = '{selected_id}'"
-        style_data_conditional.append({
-            "if": {"filter_query": filter_query},
-            "backgroundColor": "#F39C12",
-            "color": "white",
-        })
-
-    label_to_col = {v: k for k, v in labels.items()}
-    dimensions = parallel_fig["data"][0]["dimensions"]
-    for i, dim in enumerate(dimensions):
-        if i == 3:
-            dim["constraintrange"] = None
-            continue
-        orig_col = label_to_col.get(dim["label"], None)
-        if orig_col is None:
-            continue
-        values = df.iloc[selected_indices][orig_col]
-        try:
-            numeric_values = values.astype(float)
-            ranges = []
-            for v in numeric_values:
-                delta = abs(v) / 100000 if v != 0 else 0.00001
-                ranges.append([v - delta, v + delta])
-            dim["constraintrange"] = ranges
-        except Exception:
-            if not values.empty:
-                dim["constraintrange"] = [values.iloc[0], values.iloc[0]]
-            else:
-                dim["constraintrange"] = None
+            parallel_patch = Patch()
+            for i in range(len(dataset.dimensions_to_plot)):
+                parallel_patch["data"][0]["dimensions"][i]["constraintrange"] = None
+            return "", 0, parallel_patch, {}, drop_job(job_state, "select-all")
+
+    # Branch for the nearest-design lookup
+    if "nearest-button.n_clicks" in triggered_prop:
+        if not nearest_clicks or any(value is None for value in nearest_target):
+            raise PreventUpdate
+        rows, _ = dataset.parameter_index.nearest(nearest_target, int(nearest_k or 5))
+        selected_indices = rows.tolist()
+        page_number = selection_page(dataset, selected_indices, filter_query, sort_by, page_size, show_selected)
+        return (encode_selection(selected_indices), page_number, select_points_in_parallel(dataset, selected_indices),
+                {}, drop_job(job_state, "select-all"))
+
+    raise PreventUpdate
+
+
+def brushed_rows(dataset, brushes):
+    # brushes normalized (sorted ranges per axis) so equivalent brushes share a cache entry
+    brushes = {col: sorted(map(list, ranges)) for col, ranges in brushes.items() if ranges}
+    return result_cache.cached("brush-rows", dataset, brushes,
+                               lambda: dataset.range_index.query(brushes).tolist())
+
+
+def select_points_in_parallel(dataset, selected_indices):
+    # Narrow every dimension (except the 4th) to the selected lines. These
+    # ranges are rebuilt from the selection and never stored.
+    return constraints_patch(dataset, selection_constraints(dataset, selected_indices))
+
+
+def constraints_patch(dataset, constraints):
+    parallel_patch = Patch()
+    for i in range(len(dataset.dimensions_to_plot)):
+        parallel_patch["data"][0]["dimensions"][i]["constraintrange"] = constraints.get(str(i))
+    return parallel_patch
+
+
+def select_all_rows(dataset, filter_query, sort_by, page_size, show_selected, job):
+    # The select-all branch as a background job: filter in blocks, then
+    # find the table page. poll_jobs narrows the parallel plot.
+    def report(fraction):
+        job.report(0.8 * fraction, "Selecting filtered rows")
+
+    selected_indices = result_cache.cached(
+        "filter-rows", dataset, filter_query or "",
+        lambda: query_rows_in_chunks(dataset.df, filter_query, report).tolist())
+    job.report(0.8, "Finding the table page")
+    page_number = selection_page(dataset, selected_indices, filter_query, sort_by, page_size, show_selected)
+    return {"selection": encode_selection(selected_indices), "page": page_number}
+
+
+def select_points_in_scatter(dataset, scatter_view, selected_indices):
+    # selectedpoints are positions in the drawn (possibly downsampled) trace
+    selectedpoints = scatter_selectedpoints(dataset, scatter_view, selected_indices)
+    if selectedpoints is None:
+        return no_update
+    scatter_patch = Patch()
+    scatter_patch["data"][0]["selectedpoints"] = selectedpoints
+    return scatter_patch
 
-    scatter_fig["data"][0]["selectedpoints"] = selected_indices
 
-    return selected_indices, page_number, style_data_conditional, parallel_fig, scatter_fig
+def selection_page(dataset, selected_indices, filter_query, sort_by, page_size, show_selected):
+    # Table page showing the first selected row in the current filter/sort.
+    if not len(selected_indices):
+        return 0
+    rows = selected_indices if show_selected and "show_selected" in show_selected else None
+    view = table_view(dataset.df, filter_query, sort_by, rows)
+    return first_page_of(view, selected_indices, page_size)
+
 
 # -------------------------------
 # CALLBACK TO FILTER DATATABLE DATA
 # -------------------------------
 @callback(
-    Output("data-table", "data"),
-    [Input("show-selected-checkbox", "value"),
-     Input("data-table", "selected_rows")]
+    [Output(match_id("data-table"), "data"),
+     Output(match_id("data-table"), "page_count"),
+     Output(match_id("data-table"), "selected_rows")],
+    [Input(match_id("show-selected-checkbox"), "value"),
+     Input(match_id("selection-store"), "data"),
+     Input(match_id("data-table"), "page_current"),
+     Input(match_id("data-table"), "page_size"),
+     Input(match_id("data-table"), "filter_query"),
+     Input(match_id("data-table"), "sort_by"),
+     Input(match_id("stream-store"), "data")]
 )
-def update_table_data(show_selected, selected_rows):
-    if show_selected and "show_selected" in show_selected:
-        if selected_rows:
-            return df.iloc[selected_rows].to_dict("records")
-        else:
-            return []
+def update_table_data(show_selected, selection, page_current, page_size, filter_query, sort_by, stream):
+    showing_selected = show_selected and "show_selected" in show_selected
+    if callback_context.triggered_id and callback_context.triggered_id["type"] == "selection-store" \
+            and not showing_selected:
+        # the page is re-flagged in the browser (see linked_selection.js)
+        raise PreventUpdate
+    df = current_dataset().df
+    selection = decode_selection(selection, len(df))
+    view = table_view(df, filter_query, sort_by, selection if showing_selected else None)
+    records, page_selected = page_records(df, view, page_current, page_size, selection)
+    return records, page_count(view, page_size), page_selected
+
+
+# -------------------------------
+# CALLBACK TO RE-SAMPLE (OR RE-BIN) THE SCATTER ON ZOOM
+# -------------------------------
+@callback(
+    [Output(match_id("scatter-plot"), "figure", allow_duplicate=True),
+     Output(match_id("scatter-view"), "data")],
+    Input(match_id("scatter-plot"), "relayoutData"),
+    [State(match_id("scatter-view"), "data"),
+     State(match_id("selection-store"), "data")],
+    prevent_initial_call=True
+)
+def update_scatter_detail(relayout, scatter_view, selection):
+    dataset = current_dataset()
+    # small datasets already draw every point
+    if not relayout or not (is_downsampled(dataset) or is_density(scatter_view)):
+        raise PreventUpdate
+    scatter_view = scatter_view_from_relayout(scatter_view, relayout)
+    if scatter_view is None:
+        raise PreventUpdate
+    if is_density(scatter_view):
+        return create_density_figure(dataset, scatter_view), scatter_view
+    x, y, customdata = scatter_trace_data(dataset, scatter_view)
+    scatter_patch = select_points_in_scatter(dataset, scatter_view, decode_selection(selection, len(dataset.df)))
+    scatter_patch["data"][0]["x"] = typed_array(x)
+    scatter_patch["data"][0]["y"] = typed_array(y)
+    scatter_patch["data"][0]["customdata"] = typed_array(customdata)
+    return scatter_patch, scatter_view
+
+
+# -------------------------------
+# CALLBACK TO SWITCH THE SCATTER AXES OR BETWEEN POINTS AND DENSITY
+# -------------------------------
+@callback(
+    [Output(match_id("scatter-plot"), "figure", allow_duplicate=True),
+     Output(match_id("scatter-view"), "data", allow_duplicate=True)],
+    [Input(match_id("scatter-mode"), "value"),
+     Input(match_id("scatter-option"), "value")],
+    State(match_id("selection-store"), "data"),
+    prevent_initial_call=True
+)
+def switch_scatter_view(mode, option_key, selection):
+    dataset = current_dataset()
+    # the zoom window is reset along with the figure; the figures come from
+    # the cache, see create_scatter_figure and create_density_figure
+    scatter_view = {"option": scatter_option_key(dataset, {"option": option_key}), "mode": mode}
+    return scatter_figure(dataset, scatter_view, decode_selection(selection, len(dataset.df))), scatter_view
+
+
+# -------------------------------
+# CALLBACK TO DRAW THE PARETO FRONT OF THE FILTERED DESIGNS
+# -------------------------------
+@callback(
+    [Output(match_id("scatter-plot"), "figure", allow_duplicate=True),
+     Output(match_id("job-store"), "data", allow_duplicate=True)],
+    [Input(match_id("pareto-toggle"), "value"),
+     Input(match_id("data-table"), "filter_query"),
+     Input(match_id("scatter-view"), "data")],
+    State(match_id("job-store"), "data"),
+    prevent_initial_call=True
+)
+def update_pareto_overlay(pareto_toggle, filter_query, scatter_view, job_state):
+    dataset = current_dataset()
+    if pareto_toggle and "pareto" in pareto_toggle:
+        if jobs.is_heavy(dataset):
+            # computed in the background, see poll_jobs
+            compute = partial(pareto_front, dataset, scatter_view, filter_query)
+            return no_update, start_job(job_state, "pareto", compute, "Computing the Pareto front")
+        x, y, customdata = pareto_overlay(dataset, scatter_view, filter_query)
+    elif callback_context.triggered_id["type"] == "pareto-toggle":
+        x, y, customdata = [], [], []
     else:
-        return df.to_dict("records")
+        # rebuilt figures already start with an empty overlay
+        raise PreventUpdate
+    return pareto_patch(x, y, customdata), drop_job(job_state, "pareto")
+
+
+def pareto_front(dataset, scatter_view, filter_query, job):
+    # The Pareto overlay as a background job: filter in blocks (sharing the
+    # select-all cache entry), then extract the front of the filtered rows.
+    def report(fraction):
+        job.report(0.8 * fraction, "Filtering designs")
+
+    x_col, y_col = scatter_axes(dataset, scatter_view)
+    rows = result_cache.cached(
+        "filter-rows", dataset, filter_query or "",
+        lambda: query_rows_in_chunks(dataset.df, filter_query, report).tolist())
+    job.report(0.8, "Computing the Pareto front")
+    return front_trace_data(dataset, x_col, y_col, front_of(dataset, (x_col, y_col), rows))
+
+
+def pareto_patch(x, y, customdata):
+    scatter_patch = Patch()
+    scatter_patch["data"][PARETO_TRACE]["x"] = typed_array(x)
+    scatter_patch["data"][PARETO_TRACE]["y"] = typed_array(y)
+    scatter_patch["data"][PARETO_TRACE]["customdata"] = typed_array(customdata)
+    return scatter_patch
+
+
+# -------------------------------
+# CALLBACKS TO APPEND ROWS OF A STREAMING DATASET
+# -------------------------------
+@callback(
+    Output(match_id("stream-store"), "data"),
+    Input(match_id("stream-interval"), "n_intervals"),
+    [State(match_id("stream-store"), "data"),
+     State(match_id("scatter-view"), "data")],
+    prevent_initial_call=True
+)
+def poll_stream(n_intervals, stream, scatter_view):
+    dataset = current_dataset()
+    dataset.refresh()
+    known = (stream or {}).get("rows", 0)
+    # another worker may be behind this page; it catches up on a later poll
+    if len(dataset.df) <= known:
+        raise PreventUpdate
+    return stream_rows(dataset, known, scatter_view)
+
+
+# only the new rows travel; the browser extends the figures it already holds
+clientside_callback(
+    ClientsideFunction(namespace="linked", function_name="appendRows"),
+    [Output(match_id("scatter-plot"), "figure", allow_duplicate=True),
+     Output(match_id("parallel-plot"), "figure", allow_duplicate=True)],
+    Input(match_id("stream-store"), "data"),
+    [State(match_id("scatter-plot"), "figure"),
+     State(match_id("parallel-plot"), "figure")],
+    prevent_initial_call=True
+)
+
+
+# -------------------------------
+# CALLBACK TO UPDATE THE SELECTION DISTRIBUTIONS
+# -------------------------------
+@callback(
+    [Output(match_id("distribution-plot"), "figure"),
+     Output(match_id("distribution-table"), "data")],
+    Input(match_id("selection-store"), "data")
+)
+def update_distributions(selection):
+    # also runs on page load, for pages opened from a link with a selection
+    if not selection and not callback_context.triggered_id:
+        raise PreventUpdate
+    dataset = current_dataset()
+    distributions = dataset.distributions
+    counts = distributions.counts(decode_selection(selection, len(dataset.df)))
+    distribution_patch = Patch()
+    for i, col in enumerate(distributions.columns):
+        histogram = distributions.histogram(counts[col])
+        share = histogram / histogram.sum() if histogram.sum() else histogram
+        distribution_patch["data"][2 * i + 1]["y"] = typed_array(share)
+    return distribution_patch, distribution_records(dataset, counts)
+
+
+# -------------------------------
+# CALLBACK TO UPDATE THE PARAMETER SENSITIVITY
+# -------------------------------
+@callback(
+    Output(match_id("sensitivity-plot"), "figure"),
+    Input(match_id("selection-store"), "data")
+)
+def update_sensitivity(selection):
+    # like the distributions, also runs for pages opened from a link
+    if not selection and not callback_context.triggered_id:
+        raise PreventUpdate
+    return create_sensitivity_figure(current_dataset(), selection)
+
+
+# -------------------------------
+# BACKGROUND JOBS
+# -------------------------------
+# Heavy operations on large datasets (jobs.is_heavy) are submitted as jobs;
+# job-store maps the kind of operation to its running job, and the page
+# polls it through job-interval until the result can be applied.
+def start_job(job_state, kind, compute, message, selection=None):
+    # a newer request of the same kind supersedes the running one
+    job_state = dict(job_state or {})
+    if kind in job_state:
+        jobs.cancel(job_state[kind]["id"])
+    job_state[kind] = {"id": jobs.submit(compute, message), "selection": result_cache.signature(selection)}
+    return job_state
+
+
+def drop_job(job_state, kind):
+    if kind not in (job_state or {}):
+        return no_update
+    jobs.cancel(job_state[kind]["id"])
+    return {key: job for key, job in job_state.items() if key != kind}
+
+
+@callback(
+    [Output(match_id("selection-store"), "data", allow_duplicate=True),
+     Output(match_id("data-table"), "page_current", allow_duplicate=True),
+     Output(match_id("parallel-plot"), "figure", allow_duplicate=True),
+     Output(match_id("parallel-constraints"), "data", allow_duplicate=True),
+     Output(match_id("scatter-plot"), "figure", allow_duplicate=True),
+     Output(match_id("job-store"), "data", allow_duplicate=True),
+     Output(match_id("job-progress"), "value"),
+     Output(match_id("job-progress"), "label")],
+    [Input(match_id("job-interval"), "n_intervals"),
+     Input(match_id("job-cancel"), "n_clicks")],
+    [State(match_id("job-store"), "data"),
+     State(match_id("selection-store"), "data")],
+    prevent_initial_call=True
+)
+def poll_jobs(n_intervals, cancel_clicks, job_state, selection):
+    if not job_state:
+        raise PreventUpdate
+    outputs = [no_update] * 5
+    if callback_context.triggered_id["type"] == "job-cancel":
+        for job in job_state.values():
+            jobs.cancel(job["id"])
+        return *outputs, {}, 0, ""
+    dataset = current_dataset()
+    remaining = {}
+    running = []
+    for kind, job in job_state.items():
+        status = jobs.status(job["id"]) or {"state": "failed"}
+        if status["state"] in ("queued", "running"):
+            remaining[kind] = job
+            running.append(status)
+            continue
+        value = jobs.result(job["id"]) if status["state"] == "done" else None
+        jobs.forget(job["id"])
+        if value is None:
+            continue
+        if kind == "select-all":
+            # a selection made in the browser meanwhile wins
+            if job["selection"] != result_cache.signature(selection):
+                continue
+            selected_indices = decode_selection(value["selection"], len(dataset.df))
+            outputs[:4] = [value["selection"], value["page"], select_points_in_parallel(dataset, selected_indices), {}]
+        elif kind == "pareto":
+            outputs[4] = pareto_patch(*value)
+    if not running:
+        return *outputs, remaining, 0, ""
+    progress = 100 * sum(status["progress"] for status in running) / len(running)
+    label = running[0]["message"] or "Working"
+    return *outputs, remaining if remaining != job_state else no_update, progress, f"{label}… {progress:.0f}%"
+
+
+# the progress bar shows while a job is running, and only then is it polled
+clientside_callback(
+    """
+    function (jobState) {
+        var running = Object.keys(jobState || {}).length > 0;
+        return [!running, running ? "d-flex align-items-center mb-4" : "d-none"];
+    }
+    """,
+    [Output(match_id("job-interval"), "disabled"),
+     Output(match_id("job-panel"), "className")],
+    Input(match_id("job-store"), "data")
+)
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# On-disk dataset cache. Each source CSV is parsed once and stored as one
+# .npy file per column; later loads memory-map those files, so every
+# gunicorn worker shares the same pages instead of parsing and holding a
+# private copy. Entries are keyed by source path, mtime and size, so editing
+# or replacing a CSV rebuilds its cache on the next load. Text columns are
+# stored as fixed-width strings plus, when they have missing cells, a mask
+# of those cells, which come back as None.
+CACHE_DIR = os.environ.get("DATASET_CACHE_DIR", os.path.join(".cache", "datasets"))
+
+
+def cache_key(path, read_csv_kwargs):
+    stat = os.stat(path)
+    options = json.dumps(read_csv_kwargs, sort_keys=True, default=str)
+    source = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}:{options}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+def column_arrays(series):
+    # (values, missing mask or None)
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(), None
+    # text columns are stored as fixed-width unicode, which memory-maps too
+    missing = series.isna().to_numpy()
+    values = series.where(~missing, "").astype(str).to_numpy(dtype=str)
+    return values, missing if missing.any() else None
+
+
+def entry_prefix(path):
+    # same-named CSVs in different directories get their own entries
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{name}-{hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]}-"
+
+
+def build_cache(path, target, **read_csv_kwargs):
+    frame = pd.read_csv(path, **read_csv_kwargs)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # write into a private directory and rename it into place, so workers
+    # starting at the same time never see a half-written cache
+    tmp = tempfile.mkdtemp(dir=CACHE_DIR)
+    columns = []
+    masked = []
+    for i, col in enumerate(frame.columns):
+        values, missing = column_arrays(frame[col])
+        np.save(os.path.join(tmp, f"col_{i}.npy"), values, allow_pickle=False)
+        if missing is not None:
+            np.save(os.path.join(tmp, f"missing_{i}.npy"), missing, allow_pickle=False)
+            masked.append(i)
+        columns.append(col)
+    with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.abspath(path), "columns": columns, "rows": len(frame), "missing": masked}, f)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.exists(os.path.join(target, "manifest.json")):
+            raise
+    prune_stale(path, target)
+
+
+def prune_stale(path, current):
+    prefix = entry_prefix(path)
+    for name in os.listdir(CACHE_DIR):
+        entry = os.path.join(CACHE_DIR, name)
+        if name.startswith(prefix) and entry != current and len(name) == len(prefix) + 16:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def read_csv_cached(path, **read_csv_kwargs):
+    target = os.path.join(CACHE_DIR, entry_prefix(path) + cache_key(path, read_csv_kwargs))
+    manifest_path = os.path.join(target, "manifest.json")
+    if not os.path.exists(manifest_path):
+        build_cache(path, target, **read_csv_kwargs)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    arrays = {
+        col: np.load(os.path.join(target, f"col_{i}.npy"), mmap_mode="r", allow_pickle=False)
+        for i, col in enumerate(manifest["columns"])
+    }
+    for i in manifest.get("missing", []):
+        col = manifest["columns"][i]
+        values = arrays[col].astype(object)
+        values[np.load(os.path.join(target, f"missing_{i}.npy"), allow_pickle=False)] = None
+        arrays[col] = values
+    # copy=False keeps one block per column backed by the memory map
+    return pd.DataFrame(arrays, columns=manifest["columns"], copy=False)
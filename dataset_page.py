@@ -0,0 +1,811 @@
+from functools import lru_cache
+import os
+
+import dash
+from dash import html, dcc, dash_table
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import dash_bootstrap_components as dbc
+import pandas as pd
+from dash.dash_table.Format import Format, Scheme
+
+from distributions import QUANTILES
+from export import EXPORT_FORMATS, EXPORT_PATH
+from jobs import JOB_POLL_SECONDS
+from pareto import front_rows
+import result_cache
+from typed_arrays import compact_figure, figure_json
+from selection import MAX_SELECTION_RANGES, SELECTED_ROW_STYLE, covering_ranges, decode_selection, encode_selection
+from sensitivity import MEASURES
+
+# Page template shared by every registered dataset. Component ids are
+# pattern-matching dicts {"type": ..., "dataset": name}, so one set of
+# callbacks serves all dataset pages.
+
+
+def component_id(dataset, component):
+    return {"type": component, "dataset": dataset.name}
+
+
+def create_parallel_figure(dataset):
+    return result_cache.cached("parallel-figure", dataset, None, lambda: build_parallel_figure(dataset))
+
+
+def build_parallel_figure(dataset):
+    df = dataset.df
+    fig_parallel = px.parallel_coordinates(
+        df,
+        dimensions=dataset.dimensions_to_plot,
+        color=df[dataset.color_col],
+        labels=dataset.labels,
+        color_continuous_scale=px.colors.diverging.Tealrose,
+    )
+    fig_parallel.update_layout(
+        coloraxis_colorbar=dict(title=dataset.color_title),
+        margin=dict(l=35, r=50, t=50, b=60),
+        plot_bgcolor="#FFFFFF",
+        paper_bgcolor="#FFFFFF",
+        font_color="#2C3E50"
+    )
+    fig_parallel.update_traces(unselected=dict(line=dict(opacity=0)))
+    return compact_figure(fig_parallel)
+
+
+# Large-data scatter. The scatter is always drawn with scattergl; above
+# MAX_SCATTER_POINTS rows it is downsampled on the server to one point per
+# occupied grid cell plus the axis extremes, so sparse outliers survive, and
+# it is re-sampled for the visible window when the user zooms. customdata
+# carries the true row position of every drawn point.
+MAX_SCATTER_POINTS = 20000
+SAMPLE_GRID = 120
+
+
+def is_downsampled(dataset):
+    return len(dataset.df) > MAX_SCATTER_POINTS
+
+
+def scatter_option_key(dataset, scatter_view):
+    # the stored view, or the first available one when it is unknown here
+    key = (scatter_view or {}).get("option")
+    return key if key in dataset.scatter_views else dataset.scatter_views[0]
+
+
+def scatter_axes(dataset, scatter_view):
+    option = dataset.scatter_options[scatter_option_key(dataset, scatter_view)]
+    return option["x"], option["y"]
+
+
+def rows_in_box(dataset, x_col, y_col, x_range=None, y_range=None):
+    x = dataset.numeric[x_col]
+    y = dataset.numeric[y_col]
+    visible = np.isfinite(x) & np.isfinite(y)
+    if x_range:
+        visible &= (x >= min(x_range)) & (x <= max(x_range))
+    if y_range:
+        visible &= (y >= min(y_range)) & (y <= max(y_range))
+    return np.flatnonzero(visible)
+
+
+@lru_cache(maxsize=64)
+def scatter_sample(dataset, x_col, y_col, x_range=None, y_range=None):
+    if not is_downsampled(dataset):
+        return np.arange(len(dataset.df))
+    rows = rows_in_box(dataset, x_col, y_col, x_range, y_range)
+    if len(rows) <= MAX_SCATTER_POINTS:
+        return rows
+
+    xs = dataset.numeric[x_col][rows]
+    ys = dataset.numeric[y_col][rows]
+    # axis extremes
+    keep = [rows[np.argmin(xs)], rows[np.argmax(xs)], rows[np.argmin(ys)], rows[np.argmax(ys)]]
+    # one representative per occupied cell keeps outliers and the outline
+    x_span = np.ptp(xs) or 1.0
+    y_span = np.ptp(ys) or 1.0
+    xi = np.minimum(((xs - xs.min()) / x_span * SAMPLE_GRID).astype(np.intp), SAMPLE_GRID - 1)
+    yi = np.minimum(((ys - ys.min()) / y_span * SAMPLE_GRID).astype(np.intp), SAMPLE_GRID - 1)
+    _, first = np.unique(xi * SAMPLE_GRID + yi, return_index=True)
+    sample = np.union1d(keep, rows[first])
+    # fill the remaining budget with a fixed random subset so density shows
+    budget = MAX_SCATTER_POINTS - len(sample)
+    if budget > 0:
+        rest = np.setdiff1d(rows, sample, assume_unique=True)
+        rng = np.random.default_rng(0)
+        sample = np.union1d(sample, rng.choice(rest, size=min(budget, len(rest)), replace=False))
+    return sample
+
+
+def scatter_rows(dataset, scatter_view):
+    # Row positions drawn by the scatter for the stored view.
+    x_col, y_col = scatter_axes(dataset, scatter_view)
+    x_range = tuple(scatter_view["x_range"]) if scatter_view.get("x_range") else None
+    y_range = tuple(scatter_view["y_range"]) if scatter_view.get("y_range") else None
+    return scatter_sample(dataset, x_col, y_col, x_range, y_range)
+
+
+def scatter_selectedpoints(dataset, scatter_view, selected_indices):
+    if is_density(scatter_view):
+        # the heatmap has no points to mark
+        return None
+    if not is_downsampled(dataset):
+        return np.asarray(selected_indices, dtype=np.intp).tolist()
+    rows = scatter_rows(dataset, scatter_view or {})
+    return np.flatnonzero(np.isin(rows, np.asarray(selected_indices, dtype=np.intp))).tolist()
+
+
+def selection_constraints(dataset, selected_indices):
+    # {dimension index: covering ranges} narrowing every parallel dimension
+    # (except the 4th) to the selected lines.
+    constraints = {}
+    rows = np.asarray(selected_indices, dtype=np.intp)
+    for i, col in enumerate(dataset.dimensions_to_plot):
+        if i == 3:
+            continue
+        ranges = covering_ranges(dataset.range_index.distinct_values(col, rows))
+        if ranges:
+            constraints[str(i)] = ranges
+    return constraints
+
+
+def scatter_view_from_relayout(scatter_view, relayout):
+    # New zoom window from a relayoutData event, or None if it did not zoom.
+    scatter_view = dict(scatter_view or {})
+    changed = False
+    for axis in ("x", "y"):
+        key = f"{axis}axis"
+        if relayout.get(f"{key}.autorange"):
+            scatter_view[f"{axis}_range"] = None
+            changed = True
+        elif f"{key}.range[0]" in relayout and f"{key}.range[1]" in relayout:
+            scatter_view[f"{axis}_range"] = [relayout[f"{key}.range[0]"], relayout[f"{key}.range[1]"]]
+            changed = True
+        elif f"{key}.range" in relayout:
+            scatter_view[f"{axis}_range"] = list(relayout[f"{key}.range"])
+            changed = True
+    return scatter_view if changed else None
+
+
+def point_rows(points):
+    # True row positions of clicked/selected scatter points; a design can be
+    # hit twice when it is also drawn on the Pareto front overlay.
+    rows = [int(pt["customdata"][-1]) if pt.get("customdata") else pt["pointIndex"] for pt in points]
+    return list(dict.fromkeys(rows))
+
+
+def selected_scatter_rows(dataset, scatter_view, selected_data):
+    box = selected_data.get("range")
+    if box and (is_downsampled(dataset) or is_density(scatter_view)):
+        # a box covers hidden points (or heatmap cells) too, so resolve it
+        # against the full data
+        x_col, y_col = scatter_axes(dataset, scatter_view)
+        return rows_in_box(dataset, x_col, y_col, box.get("x"), box.get("y")).tolist()
+    return point_rows(selected_data.get("points", []))
+
+
+def scatter_trace_data(dataset, scatter_view):
+    # x, y and customdata of the points drawn for the stored view
+    x_col, y_col = scatter_axes(dataset, scatter_view)
+    rows = scatter_rows(dataset, scatter_view)
+    customdata = np.column_stack([dataset.df[dataset.id_column].to_numpy()[rows], rows])
+    return dataset.numeric[x_col][rows], dataset.numeric[y_col][rows], customdata
+
+
+SCATTER_LAYOUT = dict(
+    clickmode='event+select',
+    dragmode='select',
+    margin=dict(l=30, r=20, t=20, b=60),
+    xaxis=dict(showgrid=True, gridcolor="lightgrey", zeroline=True, zerolinecolor="black"),
+    yaxis=dict(showgrid=True, gridcolor="lightgrey", zeroline=True, zerolinecolor="black"),
+    plot_bgcolor="#FFFFFF",
+    paper_bgcolor="#FFFFFF",
+    font_color="#2C3E50",
+)
+
+
+def create_scatter_figure(dataset, option_key):
+    # cached per axis pair, so views sharing axes share the figure
+    return result_cache.cached("scatter-figure", dataset, list(scatter_axes(dataset, {"option": option_key})),
+                               lambda: build_scatter_figure(dataset, option_key))
+
+
+def build_scatter_figure(dataset, option_key):
+    x_col, y_col = scatter_axes(dataset, {"option": option_key})
+    x, y, customdata = scatter_trace_data(dataset, {"option": option_key})
+    # a frame of its own for plotly; the dataset frame is never written to
+    plot_df = pd.DataFrame({x_col: x, y_col: y})
+    plot_df[dataset.id_column] = customdata[:, 0]
+    fig = px.scatter(
+        plot_df,
+        x=x_col,
+        y=y_col,
+        hover_data=[dataset.id_column],
+        render_mode="webgl"
+    )
+    fig.update_traces(customdata=customdata)
+    fig.update_traces(
+        marker=dict(size=8, opacity=0.7),
+        selected=dict(marker=dict(color='red', opacity=1, size=10)),
+        unselected=dict(marker=dict(opacity=0.3))
+    )
+    fig.add_trace(pareto_trace())
+    # zoom survives selection updates but not a switch to other axes
+    fig.update_layout(**SCATTER_LAYOUT, uirevision=f"{x_col}|{y_col}", showlegend=False)
+    return compact_figure(fig)
+
+
+# Density mode. Instead of individual points the Total Ideal Loads plot
+# shows a 2D histogram of the visible window, binned on the server and
+# re-binned on zoom, so only the grid is sent. A transparent marker per
+# occupied cell keeps box select available; the box is then resolved as a
+# range query against the full data.
+DENSITY_BINS = 120
+
+
+def is_density(scatter_view):
+    return (scatter_view or {}).get("mode") == "density"
+
+
+def density_bounds(values, view_range):
+    # bin over the zoom window, or over the data when not zoomed
+    if view_range:
+        low, high = sorted(view_range)
+    elif len(values):
+        low, high = values.min(), values.max()
+    else:
+        low, high = 0.0, 1.0
+    return [low, high] if high > low else [low - 0.5, low + 0.5]
+
+
+def create_density_figure(dataset, scatter_view):
+    params = {key: scatter_view.get(key) for key in ("option", "x_range", "y_range")}
+    return result_cache.cached("density-figure", dataset, params,
+                               lambda: build_density_figure(dataset, scatter_view))
+
+
+def build_density_figure(dataset, scatter_view):
+    x_col, y_col = scatter_axes(dataset, scatter_view)
+    rows = rows_in_box(dataset, x_col, y_col, scatter_view.get("x_range"), scatter_view.get("y_range"))
+    xs = dataset.numeric[x_col][rows]
+    ys = dataset.numeric[y_col][rows]
+    bounds = [density_bounds(xs, scatter_view.get("x_range")), density_bounds(ys, scatter_view.get("y_range"))]
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=DENSITY_BINS, range=bounds)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    xi, yi = np.nonzero(counts)
+    # float32 is plenty for counts and halves the grid payload
+    z = counts.T.astype(np.float32)
+    z[z == 0] = np.nan
+    x_centers = x_centers.astype(np.float32)
+    y_centers = y_centers.astype(np.float32)
+    fig = go.Figure([
+        go.Heatmap(x=x_centers, y=y_centers, z=z, colorscale=px.colors.diverging.Tealrose,
+                   colorbar=dict(title="Designs"),
+                   hovertemplate=f"{x_col}=%{{x}}<br>{y_col}=%{{y}}<br>designs=%{{z}}<extra></extra>"),
+        pareto_trace(),
+        go.Scattergl(x=x_centers[xi], y=y_centers[yi], mode="markers", marker=dict(opacity=0),
+                     hoverinfo="skip", showlegend=False),
+    ])
+    fig.update_layout(**SCATTER_LAYOUT, uirevision=f"density|{x_col}|{y_col}",
+                      xaxis_title=x_col, yaxis_title=y_col)
+    return fig
+
+
+# Pareto front overlay. Both scatter modes reserve trace PARETO_TRACE for the
+# non-dominated designs of the current axes (minimized), computed on the rows
+# passing the table filter; it stays empty while the overlay is off.
+PARETO_TRACE = 1
+
+
+def pareto_trace():
+    return go.Scattergl(x=[], y=[], mode="lines+markers", name="Pareto front",
+                        line=dict(color="#E67E22", shape="hv"),
+                        marker=dict(color="#E67E22", size=9, symbol="diamond"),
+                        showlegend=False)
+
+
+def pareto_overlay(dataset, scatter_view, filter_query):
+    x_col, y_col = scatter_axes(dataset, scatter_view)
+    return front_trace_data(dataset, x_col, y_col, front_rows(dataset, (x_col, y_col), filter_query or ""))
+
+
+def front_trace_data(dataset, x_col, y_col, rows):
+    x = dataset.numeric[x_col][rows]
+    y = dataset.numeric[y_col][rows]
+    # draw the front as a staircase from left to right
+    order = np.argsort(x, kind="stable")
+    rows = rows[order]
+    customdata = np.column_stack([dataset.df[dataset.id_column].to_numpy()[rows], rows])
+    return x[order], y[order], customdata
+
+
+def scatter_option_label(dataset, key):
+    x_col, y_col = scatter_axes(dataset, {"option": key})
+    return f"{y_col.strip()} vs {x_col.strip()}"
+
+
+def scatter_figure(dataset, scatter_view, selected_indices):
+    # Figure for the scatter card in the stored mode, with the selection applied.
+    if is_density(scatter_view):
+        return create_density_figure(dataset, scatter_view)
+    fig = create_scatter_figure(dataset, scatter_option_key(dataset, scatter_view))
+    if len(selected_indices):
+        fig.update_traces(selectedpoints=scatter_selectedpoints(dataset, scatter_view, selected_indices),
+                          selector=0)
+    return fig
+
+
+# Distribution panel. One subplot per plotted column with the share of all
+# designs per bin (grey) and the share of the selected designs (orange);
+# trace 2*i+1 holds the selection of column i and is patched on change.
+DISTRIBUTION_COLUMNS = 4
+
+
+def create_distribution_figure(dataset):
+    distributions = dataset.distributions
+    columns = distributions.columns
+    rows = -(-len(columns) // DISTRIBUTION_COLUMNS)
+    fig = make_subplots(rows=rows, cols=DISTRIBUTION_COLUMNS, subplot_titles=[dataset.labels[col] for col in columns],
+                        horizontal_spacing=0.05, vertical_spacing=0.25)
+    for i, col in enumerate(columns):
+        edges = distributions.display_edges(col)
+        centers = (edges[:-1] + edges[1:]) / 2
+        baseline = distributions.histogram(distributions.baseline[col])
+        position = dict(row=i // DISTRIBUTION_COLUMNS + 1, col=i % DISTRIBUTION_COLUMNS + 1)
+        fig.add_trace(go.Bar(x=centers, y=baseline / max(baseline.sum(), 1), name="All",
+                             marker_color="lightgrey", showlegend=i == 0), **position)
+        fig.add_trace(go.Bar(x=centers, y=np.zeros(len(centers)), name="Selected",
+                             marker_color="#F39C12", opacity=0.8, showlegend=i == 0), **position)
+    fig.update_layout(barmode="overlay", bargap=0, height=230 * rows,
+                      margin=dict(l=30, r=20, t=40, b=30),
+                      legend=dict(orientation="h", y=1.12, x=1, xanchor="right"),
+                      plot_bgcolor="#FFFFFF", paper_bgcolor="#FFFFFF", font_color="#2C3E50")
+    fig.update_yaxes(tickformat=".0%", showgrid=True, gridcolor="lightgrey")
+    fig.update_annotations(font_size=12)
+    return compact_figure(fig)
+
+
+def quantile_label(values):
+    return " / ".join("–" if value is None else f"{value:.3g}" for value in values)
+
+
+def distribution_records(dataset, selection_counts=None):
+    # One row per column: quantiles of the selection next to the full data.
+    distributions = dataset.distributions
+    records = []
+    for col in distributions.columns:
+        selected = [None] * len(QUANTILES)
+        if selection_counts is not None:
+            selected = distributions.quantiles(col, selection_counts[col])
+        records.append({
+            "column": dataset.labels[col],
+            "selected": quantile_label(selected),
+            "all": quantile_label(distributions.quantiles(col, distributions.baseline[col])),
+        })
+    return records
+
+
+# Sensitivity panel. One subplot per load with a bar per envelope parameter
+# and measure (see sensitivity.py), for the current selection or, without
+# one, for every design. Cached per dataset and selection token.
+def create_sensitivity_figure(dataset, selection=""):
+    return result_cache.cached("sensitivity-figure", dataset, selection or "",
+                               lambda: build_sensitivity_figure(dataset, selection))
+
+
+def build_sensitivity_figure(dataset, selection=""):
+    sensitivity = dataset.sensitivity
+    measures = sensitivity.measures(decode_selection(selection, len(dataset.df)))
+    outputs = sensitivity.outputs
+    fig = make_subplots(rows=1, cols=max(len(outputs), 1), shared_yaxes=True, horizontal_spacing=0.04,
+                        subplot_titles=[dataset.labels[col] for col in outputs])
+    parameters = [col.strip() for col in sensitivity.inputs]
+    for k in range(len(outputs)):
+        for measure, (key, name) in enumerate(MEASURES.items()):
+            values = measures[key][:, k] if measures else np.zeros(len(parameters))
+            fig.add_trace(go.Bar(x=values, y=parameters, orientation="h", name=name,
+                                 marker_color=px.colors.qualitative.Safe[measure], showlegend=k == 0,
+                                 hovertemplate="%{y}: %{x:.3f}<extra>" + name + "</extra>"),
+                          row=1, col=k + 1)
+    if measures:
+        title = f"{measures['rows']:,} designs · linear fit R² " + \
+                " / ".join(f"{value:.2f}" for value in measures["r2"])
+    else:
+        title = "Select at least a few designs"
+    fig.update_layout(barmode="group", height=120 + 45 * len(parameters),
+                      title=dict(text=title, font_size=12, x=0.01),
+                      margin=dict(l=30, r=20, t=60, b=30),
+                      legend=dict(orientation="h", y=1.12, x=1, xanchor="right"),
+                      plot_bgcolor="#FFFFFF", paper_bgcolor="#FFFFFF", font_color="#2C3E50")
+    fig.update_xaxes(range=[-1, 1], showgrid=True, gridcolor="lightgrey", zeroline=True, zerolinecolor="black")
+    fig.update_yaxes(autorange="reversed")
+    fig.update_annotations(font_size=12)
+    return compact_figure(fig)
+
+
+# custom styles
+CARDHEADER_STYLE = {"backgroundColor": "#2AACFD", "color": "white",
+                    "borderRadius": "0px", "borderBottom": "1px solid #2C3E50",
+                    "boxShadow": "0 2px 4px rgba(0, 0, 0, 0.5)"}
+CARD_STYLE = {"borderRadius": "0px", "boxShadow": "0 4px 12px rgba(0, 1, 1, 0.15)",
+              "border": "none", "backgroundColor": "#FFFFFF"}
+CHECKBOX_STYLE = {"position": "absolute", "zIndex": "1000", "backgroundColor": "rgba(236, 240, 241, 0)",
+                  "padding": "5px", "borderRadius": "5px"}
+
+
+# how often the page of a streaming dataset asks for new rows
+STREAM_POLL_SECONDS = int(os.environ.get("STREAM_POLL_SECONDS", "5"))
+
+
+def stream_rows(dataset, start, scatter_view):
+    # Columns of the rows appended since `start`, in the shape the browser
+    # extends the figures with (see appendRows in linked_selection.js).
+    new = dataset.df.iloc[start:]
+    rows = np.arange(start, len(dataset.df))
+    appended = {
+        "start": start,
+        "rows": len(dataset.df),
+        "parallel": {
+            "values": [new[col].tolist() for col in dataset.dimensions_to_plot],
+            "color": new[dataset.color_col].tolist(),
+        },
+    }
+    if not is_density(scatter_view):
+        x_col, y_col = scatter_axes(dataset, scatter_view)
+        appended["scatter"] = {
+            "x": dataset.numeric[x_col][start:].tolist(),
+            "y": dataset.numeric[y_col][start:].tolist(),
+            "customdata": np.column_stack([new[dataset.id_column].to_numpy(), rows]).tolist(),
+        }
+    return appended
+
+
+def page_figures(dataset):
+    # The figures a freshly opened page starts with, as JSON data. Snapshotted
+    # in the result cache per dataset version, so building a page (e.g. when
+    # the gunicorn master preloads, see gunicorn.conf.py) skips plotly.
+    builders = {
+        "parallel": lambda: create_parallel_figure(dataset),
+        "scatter": lambda: create_scatter_figure(dataset, dataset.scatter_views[0]),
+        "distribution": lambda: create_distribution_figure(dataset),
+        "sensitivity": lambda: create_sensitivity_figure(dataset),
+    }
+    return result_cache.cached("page-figures", dataset, None,
+                               lambda: {name: figure_json(build()) for name, build in builders.items()})
+
+
+def nearest_default(series):
+    # the column median, or an empty input while the column has no numbers
+    # (a stream without rows yet)
+    median = pd.to_numeric(series, errors="coerce").median()
+    return round(float(median), 3) if np.isfinite(median) else None
+
+
+def waiting_layout(dataset):
+    # the page of a stream that has not written its header yet
+    return dbc.Container(
+        html.P(f"Waiting for the first results in {dataset.source}. Reload the page once the run has written them.",
+               style={"marginTop": "20px"}),
+        fluid=True
+    )
+
+
+def dataset_layout(dataset, selected_rows=(), constraints=None):
+    # selected_rows/constraints restore the state of a shared link. Only the
+    # user's brushes are stored; without any, the parallel plot is narrowed
+    # to the selected rows.
+    df = dataset.df
+    id_column = dataset.id_column
+    figures = page_figures(dataset)
+    fig_parallel = figures["parallel"]
+    fig_scatter = figures["scatter"]
+    scatter_view = {"option": dataset.scatter_views[0], "mode": "points"}
+    ranges_shown = constraints
+    if len(selected_rows) and not constraints:
+        ranges_shown = selection_constraints(dataset, selected_rows)
+    if ranges_shown:
+        fig_parallel = create_parallel_figure(dataset)
+        for key, ranges in ranges_shown.items():
+            fig_parallel.data[0].dimensions[int(key)].constraintrange = ranges
+    if len(selected_rows):
+        fig_scatter = scatter_figure(dataset, scatter_view, selected_rows)
+
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader(
+                        html.Div([
+                            html.Span("Total Ideal Loads", style={"fontWeight": "bold"}),
+                            html.Span("ⓘ", id=component_id(dataset, "tip-total"), style={
+                                "color": "white", "marginLeft": "10px",
+                                "cursor": "pointer",
+                                "fontSize": "18px"
+                            })
+                        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "center"}),
+                        style=CARDHEADER_STYLE
+                    ),
+                    dbc.Tooltip("This scatter plot visualizes the relationship between total cooling and heating loads. Use it to detect clusters, outliers, and optimal instances in your dataset. You can filter outputs by selecting them.",
+                                target=component_id(dataset, "tip-total"), placement="right-start", style={"zIndex": 3000}),
+                    dbc.CardBody([
+                        html.Div([
+                            dcc.RadioItems(
+                                id=component_id(dataset, "scatter-mode"),
+                                options=[{"label": " Points", "value": "points"},
+                                         {"label": " Density", "value": "density"}],
+                                value="points",
+                                inline=True,
+                                inputStyle={"marginLeft": "10px"}
+                            ),
+                            dcc.Checklist(
+                                id=component_id(dataset, "pareto-toggle"),
+                                options=[{"label": " Pareto front", "value": "pareto"}],
+                                value=[],
+                                inline=True,
+                                inputStyle={"marginLeft": "10px"}
+                            ),
+                            # only the views whose axes this dataset has
+                            dcc.Dropdown(
+                                id=component_id(dataset, "scatter-option"),
+                                options=[{"label": scatter_option_label(dataset, key), "value": key}
+                                         for key in dataset.scatter_views],
+                                value=scatter_view["option"],
+                                clearable=False,
+                                searchable=False,
+                                style={"width": "280px", "fontSize": "13px", "marginLeft": "auto"}
+                            ),
+                        ], style={"display": "flex", "gap": "20px", "alignItems": "center"}),
+                        dcc.Graph(id=component_id(dataset, "scatter-plot"), figure=fig_scatter),
+                        dcc.Store(id=component_id(dataset, "scatter-view"),
+                                  data=scatter_view),
+                        # streaming datasets poll for rows appended since the page was built
+                        dcc.Interval(id=component_id(dataset, "stream-interval"),
+                                     interval=STREAM_POLL_SECONDS * 1000, disabled=not dataset.streaming),
+                        dcc.Store(id=component_id(dataset, "stream-store"), data={"rows": len(df)}),
+                    ])
+                ], style=CARD_STYLE),
+                width=6
+            ),
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader(
+                        html.Div([
+                            html.Span("Parallel Coordinates Plot", style={"fontWeight": "bold"}),
+                            html.Span("ⓘ", id=component_id(dataset, "tip-parallel"), style={
+                                "color": "white", "marginLeft": "10px",
+                                "cursor": "pointer",
+                                "fontSize": "18px"
+                            })
+                        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "center"}),
+                        style=CARDHEADER_STYLE
+                    ),
+                    dbc.Tooltip("This parallel coordinates plot reveals multi-variable relationships across the full dataset. Use axis brushing to filter and explore correlations among high-dimensional parameters.",
+                                target=component_id(dataset, "tip-parallel"), placement="left-start", style={"zIndex": 3000}),
+                    dbc.CardBody([
+                        dcc.Graph(id=component_id(dataset, "parallel-plot"), figure=fig_parallel),
+                        dcc.Store(id=component_id(dataset, "parallel-constraints"), data=constraints or {})
+                    ])
+                ], style=CARD_STYLE),
+                width=6
+            )
+        ], className="mb-4"),
+        # progress of background jobs (select-all, Pareto front), see jobs.py;
+        # shown while job-store holds a job
+        html.Div([
+            dbc.Progress(id=component_id(dataset, "job-progress"), value=0, striped=True, animated=True,
+                         style={"flex": "1", "height": "20px"}),
+            dbc.Button("Cancel", id=component_id(dataset, "job-cancel"), size="sm", color="secondary",
+                       style={"marginLeft": "10px"}),
+            dcc.Interval(id=component_id(dataset, "job-interval"), interval=JOB_POLL_SECONDS * 1000,
+                         disabled=True),
+            dcc.Store(id=component_id(dataset, "job-store"), data={}),
+        ], id=component_id(dataset, "job-panel"), className="d-none"),
+        dbc.Row([
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader(
+                        html.Div([
+                            html.Span("Instance Table", style={"fontWeight": "bold"}),
+                            html.Div([
+                                # posts the selection token to the streaming export (export.py)
+                                html.Form([
+                                    dcc.Input(id=component_id(dataset, "export-selection"), type="hidden",
+                                              name="sel", value=""),
+                                    html.Select([html.Option(label, value=fmt)
+                                                 for fmt, (label, _) in EXPORT_FORMATS.items()],
+                                                name="format", style={"fontSize": "12px"}),
+                                    dbc.Button("Export", type="submit", size="sm", color="light"),
+                                ], action=dash.get_relative_path(f"{EXPORT_PATH}/{dataset.name}"), method="POST",
+                                    style={"display": "flex", "gap": "6px", "margin": 0}),
+                                html.Span("ⓘ", id=component_id(dataset, "tip-table"), style={
+                                    "color": "white", "marginLeft": "10px",
+                                    "cursor": "pointer",
+                                    "fontSize": "18px"
+                                })
+                            ], style={"display": "flex", "alignItems": "center"}),
+                        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "center"}),
+                        style=CARDHEADER_STYLE
+                    ),
+                    dbc.Tooltip("This table shows detailed raw data of each design instance. You can sort, filter, and select rows to inspect parameter combinations or sync them with the plots.",
+                                target=component_id(dataset, "tip-table"), placement="right-start", style={"zIndex": 3000}),
+                    dbc.CardBody([
+                        html.Div([
+                            dcc.Checklist(
+                                id=component_id(dataset, "select-all-checkbox"),
+                                options=[{"label": "", "value": "select_all"}],
+                                value=[],
+                                style={**CHECKBOX_STYLE, "top": "1px", "left": "3.20px"}
+                            ),
+                            dbc.Tooltip("Select All Filtered",
+                                        target=component_id(dataset, "select-all-checkbox"), placement="top",
+                                        style={"zIndex": "3000"}),
+                            dcc.Checklist(
+                                id=component_id(dataset, "show-selected-checkbox"),
+                                options=[{"label": "", "value": "show_selected"}],
+                                value=[],
+                                style={**CHECKBOX_STYLE, "top": "30px", "left": "3.20px"}
+                            ),
+                            dbc.Tooltip("Show Selected Rows",
+                                        target=component_id(dataset, "show-selected-checkbox"), placement="top",
+                                        style={"zIndex": "3000"}),
+                            dcc.Store(id=component_id(dataset, "selection-store"), data=encode_selection(selected_rows)),
+                            dcc.Store(id=component_id(dataset, "selection-request")),
+                            # what the browser needs to resolve selections on its own
+                            dcc.Store(id=component_id(dataset, "linking"),
+                                      data={"downsampled": is_downsampled(dataset), "unlinked_dimension": 3,
+                                            "selection_ranges": MAX_SELECTION_RANGES}),
+                            dash_table.DataTable(
+                                id=component_id(dataset, "data-table"),
+                                columns=[
+                                    {
+                                        "name": col,
+                                        "id": col,
+                                        "type": "numeric" if pd.api.types.is_numeric_dtype(df[col]) else "text",
+                                        "format": Format(precision=3, scheme=Scheme.fixed)
+                                            if pd.api.types.is_numeric_dtype(df[col]) else None
+                                    }
+                                    for col in df.columns if col != id_column
+                                ],
+                                # Filtering, sorting and paging run on the server,
+                                # the browser only receives the current page.
+                                data=[],
+                                row_selectable="multi",
+                                selected_rows=[],
+                                filter_action="custom",
+                                filter_query="",
+                                sort_action="custom",
+                                sort_by=[],
+                                page_action="custom",
+                                page_current=0,
+                                page_size=10,
+                                style_table={'minWidth': '100%'},
+                                style_data_conditional=SELECTED_ROW_STYLE,
+                            )
+                        ], style={"position": "relative", "overflow": "auto",
+                                  "height": "420px", "border": "1px solid #bdc3c7",
+                                  "borderRadius": "0px"})
+                    ])
+                ], style=CARD_STYLE),
+                width=6
+            ),
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader(
+                        html.Div([
+                            html.Span("3D Model", style={"fontWeight": "bold"}),
+                            html.Span("ⓘ", id=component_id(dataset, "tip-model"), style={
+                                "color": "white", "marginLeft": "10px",
+                                "cursor": "pointer",
+                                "fontSize": "18px"
+                            })
+                        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "center"}),
+                        style=CARDHEADER_STYLE
+                    ),
+                    dbc.Tooltip("This 3D model viewer links numeric simulation outputs to building geometry. You can interact with it.",
+                                target=component_id(dataset, "tip-model"), placement="left-start", style={"zIndex": 3000}),
+                    dbc.CardBody([
+                        html.Iframe(src="https://omurbugra.github.io/Graph3dv2",
+                                    style={"width": "100%", "height": "414px", "border": "none", "borderRadius": "0px"})
+                    ])
+                ], style=CARD_STYLE),
+                width=6
+            )
+        ], className="mb-4"),
+        dbc.Row([
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader(
+                        html.Div([
+                            html.Span("Selection Distributions", style={"fontWeight": "bold"}),
+                            html.Span("ⓘ", id=component_id(dataset, "tip-distribution"), style={
+                                "color": "white", "marginLeft": "10px",
+                                "cursor": "pointer",
+                                "fontSize": "18px"
+                            })
+                        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "center"}),
+                        style=CARDHEADER_STYLE
+                    ),
+                    dbc.Tooltip("Histograms compare how each parameter and load is distributed within the current selection (orange) and across all designs (grey). The table lists the P5 / P25 / P50 / P75 / P95 quantiles.",
+                                target=component_id(dataset, "tip-distribution"), placement="right-start", style={"zIndex": 3000}),
+                    dbc.CardBody([
+                        dcc.Graph(id=component_id(dataset, "distribution-plot"),
+                                  figure=figures["distribution"], config={"displayModeBar": False}),
+                        dash_table.DataTable(
+                            id=component_id(dataset, "distribution-table"),
+                            columns=[{"name": "Column", "id": "column"},
+                                     {"name": "Selected (P5 / P25 / P50 / P75 / P95)", "id": "selected"},
+                                     {"name": "All (P5 / P25 / P50 / P75 / P95)", "id": "all"}],
+                            data=distribution_records(dataset),
+                            style_cell={"textAlign": "left", "fontSize": "0.85rem"},
+                            style_header={"fontWeight": "bold"},
+                        ),
+                    ])
+                ], style=CARD_STYLE),
+                width=12
+            )
+        ], className="mb-4"),
+        dbc.Row([
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader(
+                        html.Div([
+                            html.Span("Parameter Sensitivity", style={"fontWeight": "bold"}),
+                            html.Span("ⓘ", id=component_id(dataset, "tip-sensitivity"), style={
+                                "color": "white", "marginLeft": "10px",
+                                "cursor": "pointer",
+                                "fontSize": "18px"
+                            })
+                        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "center"}),
+                        style=CARDHEADER_STYLE
+                    ),
+                    dbc.Tooltip("How strongly each envelope parameter drives the cooling and heating loads within the current selection (all designs when nothing is selected): Spearman rank correlation, standardized regression coefficient of a linear fit, and the first-order index, the share of the load variance explained by the parameter alone.",
+                                target=component_id(dataset, "tip-sensitivity"), placement="right-start", style={"zIndex": 3000}),
+                    dbc.CardBody(
+                        dcc.Graph(id=component_id(dataset, "sensitivity-plot"),
+                                  figure=figures["sensitivity"], config={"displayModeBar": False})
+                    )
+                ], style=CARD_STYLE),
+                width=12
+            )
+        ], className="mb-4"),
+        dbc.Row([
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader(
+                        html.Div([
+                            html.Span("Nearest Designs", style={"fontWeight": "bold"}),
+                            html.Span("ⓘ", id=component_id(dataset, "tip-nearest"), style={
+                                "color": "white", "marginLeft": "10px",
+                                "cursor": "pointer",
+                                "fontSize": "18px"
+                            })
+                        ], style={"display": "flex", "justifyContent": "space-between", "alignItems": "center"}),
+                        style=CARDHEADER_STYLE
+                    ),
+                    dbc.Tooltip("Enter target envelope parameters to select the closest simulated designs. They are highlighted in the plots and the table.",
+                                target=component_id(dataset, "tip-nearest"), placement="right-start", style={"zIndex": 3000}),
+                    dbc.CardBody(
+                        html.Div([
+                            html.Div([
+                                html.Label(col.strip(), style={"fontSize": "0.85rem"}),
+                                dcc.Input(id={**component_id(dataset, "nearest-param"), "parameter": col},
+                                          type="number", value=nearest_default(df[col]),
+                                          debounce=True, style={"width": "110px"}),
+                            ])
+                            for col in dataset.parameters
+                        ] + [
+                            html.Div([
+                                html.Label("Designs", style={"fontSize": "0.85rem"}),
+                                dcc.Input(id=component_id(dataset, "nearest-k"), type="number",
+                                          value=5, min=1, max=100, step=1, style={"width": "70px"}),
+                            ]),
+                            dbc.Button("Find nearest", id=component_id(dataset, "nearest-button"),
+                                       color="primary", style={"borderRadius": "0px"}),
+                        ], style={"display": "flex", "gap": "15px", "alignItems": "flex-end", "flexWrap": "wrap"})
+                    )
+                ], style=CARD_STYLE),
+                width=12
+            )
+        ])
+    ], fluid=True, style={"backgroundColor": "#FFFFFF", "padding": "20px"})
+
@@ -0,0 +1,272 @@
+import logging
+import os
+import threading
+
+import dash
+import numpy as np
+import pandas as pd
+
+from dataset_cache import cache_key, read_csv_cached
+from dataset_page import dataset_layout, scatter_sample, waiting_layout
+from distributions import ColumnDistributions
+from nearest import ParameterIndex
+from pareto import front_rows
+import result_cache
+from range_index import ColumnRangeIndex
+from results_tail import ResultsTail
+from selection import decode_constraints, decode_selection
+from sensitivity import ParameterSensitivity
+from validation import ValidationJoin
+
+# Dataset registry. A dataset is declared once with register_dataset(); its
+# page is registered with Dash and the linked-brushing callbacks in
+# callbacks.py serve every dataset through pattern-matching ids. Nothing is
+# read from disk until someone opens the page (or a callback asks for it).
+# Streaming datasets (stream=True) tail a results file or directory that is
+# still being written; refresh() appends the rows that arrived since the
+# last poll. A stream with no columns yet (no file, or an empty one) is
+# not loaded and its page asks to come back later; one with a header but no
+# rows loads empty and takes its dtypes from the first rows that arrive. A
+# dataset with validation=ValidationJoin(...) (validation.py)
+# gains simulated-load columns joined from another dataset at load; they
+# show in the table and the scatter but not in the parallel plot.
+DATASETS = {}
+log = logging.getLogger("graph.datasets")
+
+
+class Dataset:
+    def __init__(self, name, source, path, title, scatter_options, parameters=(), outputs=(),
+                 color_title="Qheating", stream=False, validation=None):
+        self.name = name
+        self.source = source
+        self.path = path
+        self.title = title
+        self.scatter_options = scatter_options
+        self.parameters = list(parameters)
+        self.outputs = list(outputs)
+        self.color_title = color_title
+        self.streaming = stream
+        self.validation = validation
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._layout = None
+
+    def load(self):
+        with self._lock:
+            if self.loaded:
+                return self
+            if self.streaming:
+                self.tail = ResultsTail(self.source)
+                df = self.tail.read_new()
+                if df is None:
+                    if not self.tail.columns:
+                        # nothing to build a page from yet; retried on the next visit
+                        return self
+                    df = pd.DataFrame({col: pd.Series(dtype=float) for col in self.tail.columns})
+            else:
+                # dataset (parsed once, then memory-mapped from the on-disk cache)
+                df = read_csv_cached(self.source)
+            # changes whenever the source file does; keys the result cache
+            self.version = f"{cache_key(self.source, {})}-{len(df)}"
+            # last column for the color scale
+            color_col = df.columns[-1]
+            self.joined_columns = []
+            if self.validation is not None:
+                df = self.join_validation(df)
+
+            # ID column
+            id_column = None
+            for col in df.columns:
+                if col.strip().lower() == "version":
+                    id_column = col
+                    break
+            if id_column is None:
+                df.insert(0, "ID", df.index)
+                id_column = "ID"
+
+            self.df = df
+            self.id_column = id_column
+            # labels for the parallel coordinates plot
+            self.labels = {col: col.replace('_', ' ').title() for col in df.columns}
+            self.color_col = color_col
+            # Remove the first column (ID)
+            self.dimensions_to_plot = [col for col in df.columns[1:] if col not in self.joined_columns]
+            # sorted per-column index used to resolve parallel coordinates brushes
+            self.range_index = ColumnRangeIndex(df, self.dimensions_to_plot)
+            # KD-tree over the normalized envelope parameters for nearest-design lookup
+            self.parameter_index = ParameterIndex(df, self.parameters)
+            # binned columns and full-dataset histograms for the distribution panel
+            self.distributions = ColumnDistributions(df, self.dimensions_to_plot)
+            # rank codes and bins of the parameters and loads for the sensitivity panel
+            self.sensitivity = ParameterSensitivity(df, self.parameters, self.outputs)
+            # the scatter axes coerced to float once (unparseable cells are
+            # NaN); the scatter, density and Pareto code read these
+            self.numeric = numeric_columns(df, self.axis_columns())
+            # scatter views whose axes exist here and hold numbers (a stream
+            # that has no rows yet offers every view it has the columns for)
+            self.scatter_views = [key for key, option in self.scatter_options.items()
+                                  if all(self.has_numbers(option[axis]) for axis in ("x", "y"))]
+            self.loaded = True
+        return self
+
+    def refresh(self):
+        # Append the rows a streaming source gained since the last call and
+        # return them (None when nothing arrived).
+        if not self.streaming:
+            return None
+        if not self.load().loaded:
+            return None
+        with self._lock:
+            new = self.tail.read_new()
+            if new is None or not len(new):
+                return None
+            start = len(self.df)
+            if self.id_column == "ID" and "ID" not in new.columns:
+                new.insert(0, "ID", range(start, start + len(new)))
+            new = new.reindex(columns=self.df.columns)
+            new.index = range(start, start + len(new))
+            # the placeholder columns of an empty stream take the dtypes
+            # of its first rows
+            self.df = pd.concat([self.df, new]) if start else new
+            self.range_index.append(new)
+            self.parameter_index = ParameterIndex(self.df, self.parameters)
+            self.distributions = ColumnDistributions(self.df, self.dimensions_to_plot)
+            self.sensitivity = ParameterSensitivity(self.df, self.parameters, self.outputs)
+            appended = numeric_columns(new, self.numeric)
+            self.numeric = {col: np.concatenate([values, appended[col]]) for col, values in self.numeric.items()}
+            self.version = f"{cache_key(self.source, {})}-{len(self.df)}"
+            # figures and samples built from the old rows are stale
+            self._layout = None
+            scatter_sample.cache_clear()
+            front_rows.cache_clear()
+        return new
+
+    def join_validation(self, df):
+        # appends the validation columns (computed once per version of both
+        # datasets); the version then covers the simulations too
+        simulation = get_dataset(self.validation.simulation)
+        params = self.validation.params(simulation)
+        joined = result_cache.cached("validation-join", self, params,
+                                     lambda: self.validation.columns(df, simulation))
+        for col in joined.columns:
+            df[col] = joined[col].to_numpy()
+        self.joined_columns = list(joined.columns)
+        self.version = f"{self.version}-{result_cache.signature(params)[:8]}"
+        return df
+
+    def axis_columns(self):
+        columns = {option[axis] for option in self.scatter_options.values() for axis in ("x", "y")}
+        return [col for col in self.df.columns if col in columns]
+
+    def has_numbers(self, col):
+        return col in self.numeric and (not len(self.df) or np.isfinite(self.numeric[col]).any())
+
+    def nearest_designs(self, target, k=5):
+        # The k simulated designs closest to `target` ({parameter: value}),
+        # closest first, with their distance in the normalized parameter space.
+        rows, distances = self.load().parameter_index.nearest(target, k)
+        return self.df.iloc[rows].assign(distance=distances)
+
+    def layout(self, sel=None, brush=None, **kwargs):
+        if not self.load().loaded:
+            return waiting_layout(self)
+        if sel or brush:
+            # a shared link (?sel=<selection token>&brush=<brush token>)
+            # gets its own copy of the page with that state applied
+            try:
+                selected_rows = decode_selection(sel, len(self.df))
+                constraints = decode_constraints(brush, len(self.dimensions_to_plot))
+            except ValueError:
+                selected_rows, constraints = (), None
+            return dataset_layout(self, selected_rows, constraints)
+        if self._layout is None:
+            self._layout = dataset_layout(self)
+        return self._layout
+
+
+def numeric_columns(frame, columns):
+    return {col: pd.to_numeric(frame[col], errors='coerce').to_numpy(dtype=float) for col in columns}
+
+
+def register_dataset(name, source, path, title, scatter_options, **options):
+    dataset = Dataset(name, source, path, title, scatter_options, **options)
+    DATASETS[name] = dataset
+    dash.register_page(f"pages.{name}", path=path, name=title, title=title, layout=dataset.layout)
+    return dataset
+
+
+def get_dataset(name):
+    return DATASETS[name].load()
+
+
+def preload():
+    # Load every dataset and build its page now rather than on the first
+    # visit; run in the gunicorn master so forked workers share the result.
+    # A dataset that fails is logged and left to load on its first visit,
+    # so one bad source does not keep the server from starting.
+    for dataset in DATASETS.values():
+        try:
+            dataset.layout()
+        except Exception:
+            log.exception("preloading dataset %s failed", dataset.name)
+
+
+# -------------------------------
+# DATASETS
+# -------------------------------
+SCATTER_OPTIONS = {
+    "Scatter 1": {"x": "total_idealCooling", "y": "total_idealHeating"},
+    "Scatter 2": {"x": "Pareto_TIC (kWh)", "y": "Simulation_TIC (kWh)"},
+    "Scatter 3": {"x": "Simulation_TIC (kWh)", "y": "Simulation_TIH (kWh)"},
+    "Scatter 4": {"x": "MAPE_cooling", "y": "MAPE_heating"},
+}
+SWEEP_PARAMETERS = ["Transmittance", "shgc", "window_u", "roof_u", "extWall_u"]
+SWEEP_OUTPUTS = ["total_idealCooling", "total_idealHeating"]
+
+register_dataset(
+    "legofit",
+    "pages/lux_sim14000_ResAll_buildingTotal_shuffled.csv",
+    path="/",
+    title="All solutions",
+    scatter_options=SCATTER_OPTIONS,
+    parameters=SWEEP_PARAMETERS,
+    outputs=SWEEP_OUTPUTS,
+)
+register_dataset(
+    "legofit2",
+    "pages/paretoComp_II_combine_neworder.csv",
+    path="/legofit2",
+    title="Optimized",
+    scatter_options={
+        "Scatter 1": {"x": " total_idealCooling", "y": " total_idealHeating"},
+        "Scatter 2": {"x": " total_idealCooling", "y": "Simulation_TIC (kWh)"},
+        "Scatter 3": {"x": "Simulation_TIC (kWh)", "y": "Simulation_TIH (kWh)"},
+        "Scatter 4": {"x": "MAPE_cooling", "y": "MAPE_heating"},
+    },
+    parameters=[" transmittance", " shgc", " window_u", " roof_u", " extWall_u"],
+    outputs=[" total_idealCooling", " total_idealHeating"],
+    # the optimizer's designs checked against the closest simulated design
+    # of the sweep; transmittance is a fraction here and a percentage there
+    validation=ValidationJoin(
+        "legofit",
+        parameters={" transmittance": "Transmittance", " shgc": "shgc", " window_u": "window_u",
+                    " roof_u": "roof_u", " extWall_u": "extWall_u"},
+        loads={"cooling": (" total_idealCooling", "total_idealCooling"),
+               "heating": (" total_idealHeating", "total_idealHeating")},
+        scale={" transmittance": 100},
+    ),
+)
+
+# A batch that is still running: LIVE_RESULTS points at its growing results
+# CSV (or a directory of per-run CSVs) in the schema of the 14k sweep.
+if os.environ.get("LIVE_RESULTS"):
+    register_dataset(
+        "live",
+        os.environ["LIVE_RESULTS"],
+        path="/live",
+        title="Live run",
+        scatter_options=SCATTER_OPTIONS,
+        parameters=SWEEP_PARAMETERS,
+        outputs=SWEEP_OUTPUTS,
+        stream=True,
+    )
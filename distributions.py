@@ -0,0 +1,65 @@
+import numpy as np
+
+# Per-column distributions for the selection panel. Every column is binned
+# once at load time into FINE_BINS equal-width bins over its range and the
+# bin of every row is kept as int16, so the histogram of any selection is a
+# bincount over its rows. The full-dataset counts are computed once and
+# reused: a selection covering more than half of the rows is counted through
+# its (smaller) complement. Quantiles are interpolated within the fine bins.
+FINE_BINS = 1024
+DISPLAY_BINS = 32
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class ColumnDistributions:
+    def __init__(self, frame, columns):
+        self.columns = list(columns)
+        self.size = len(frame)
+        self.edges = {}
+        self.bins = {}
+        for col in self.columns:
+            values = frame[col].to_numpy(dtype=float, na_value=np.nan)
+            finite = np.isfinite(values)
+            low = values[finite].min() if finite.any() else 0.0
+            high = values[finite].max() if finite.any() else 1.0
+            if high <= low:
+                high = low + 1.0
+            self.edges[col] = np.linspace(low, high, FINE_BINS + 1)
+            scaled = np.where(finite, (values - low) / (high - low) * FINE_BINS, 0)
+            # missing values go to an overflow bin that is never reported
+            self.bins[col] = np.where(finite, np.minimum(scaled, FINE_BINS - 1), FINE_BINS).astype(np.int16)
+        self.baseline = {col: self.bincount(col, slice(None)) for col in self.columns}
+
+    def bincount(self, col, rows):
+        return np.bincount(self.bins[col][rows], minlength=FINE_BINS + 1)[:FINE_BINS]
+
+    def counts(self, rows):
+        # {column: fine-bin counts} for the given row positions
+        rows = np.asarray(rows, dtype=np.intp)
+        if len(rows) > self.size // 2:
+            rest = np.ones(self.size, dtype=bool)
+            rest[rows] = False
+            rest = np.flatnonzero(rest)
+            return {col: self.baseline[col] - self.bincount(col, rest) for col in self.columns}
+        return {col: self.bincount(col, rows) for col in self.columns}
+
+    def display_edges(self, col):
+        return self.edges[col][::FINE_BINS // DISPLAY_BINS]
+
+    @staticmethod
+    def histogram(counts):
+        return counts.reshape(DISPLAY_BINS, -1).sum(axis=1)
+
+    def quantiles(self, col, counts):
+        total = counts.sum()
+        if not total:
+            return [None] * len(QUANTILES)
+        edges = self.edges[col]
+        cumulative = np.cumsum(counts) / total
+        values = []
+        for q in QUANTILES:
+            i = int(np.searchsorted(cumulative, q))
+            before = cumulative[i - 1] if i else 0.0
+            fraction = (q - before) / (cumulative[i] - before) if cumulative[i] > before else 0.0
+            values.append(float(edges[i] + fraction * (edges[i + 1] - edges[i])))
+        return values
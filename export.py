@@ -0,0 +1,94 @@
+import io
+
+import flask
+
+import datasets
+from selection import decode_selection
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Export of the selected designs. The dataset page posts its selection token
+# to EXPORT_PATH/<name> and the rows come back as a streamed CSV or Parquet
+# download, built EXPORT_CHUNK_ROWS rows at a time, so memory stays flat
+# whatever the size of the selection; an empty selection exports no rows.
+# Parquet needs pyarrow (in requirements.txt) and is only offered when it
+# imports.
+EXPORT_PATH = "/export"
+EXPORT_CHUNK_ROWS = 50000
+EXPORT_FORMATS = {"csv": ("CSV", "text/csv")}
+if pyarrow is not None:
+    EXPORT_FORMATS["parquet"] = ("Parquet", "application/vnd.apache.parquet")
+
+
+def row_chunks(rows):
+    for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+        yield rows[start:start + EXPORT_CHUNK_ROWS]
+
+
+def csv_chunks(frame, rows):
+    yield frame.iloc[:0].to_csv(index=False).encode("utf-8")
+    for chunk in row_chunks(rows):
+        yield frame.iloc[chunk].to_csv(index=False, header=False).encode("utf-8")
+
+
+class ChunkSink(io.RawIOBase):
+    # write-only file handing out what the Parquet writer wrote so far
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def parquet_chunks(frame, rows):
+    # one row group per chunk; the footer goes out when the writer closes
+    schema = pyarrow.Schema.from_pandas(frame, preserve_index=False)
+    sink = ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    for chunk in row_chunks(rows):
+        writer.write_table(pyarrow.Table.from_pandas(frame.iloc[chunk], schema=schema, preserve_index=False))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def export_response(name):
+    if name not in datasets.DATASETS:
+        flask.abort(404)
+    dataset = datasets.get_dataset(name)
+    values = flask.request.values
+    fmt = values.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        flask.abort(400)
+    try:
+        rows = decode_selection(values.get("sel", ""), len(dataset.df))
+    except ValueError:
+        flask.abort(400)
+    chunks = parquet_chunks if fmt == "parquet" else csv_chunks
+    return flask.Response(chunks(dataset.df, rows), mimetype=EXPORT_FORMATS[fmt][1], headers={
+        "Content-Disposition": f'attachment; filename="{name}-selection.{fmt}"',
+    })
+
+
+def add_export_route(app):
+    app.server.add_url_rule(f"{EXPORT_PATH}/<name>", "export", export_response, methods=["GET", "POST"])
+    return app
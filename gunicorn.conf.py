@@ -0,0 +1,24 @@
+import gc
+import os
+
+# Gunicorn settings (picked up from the working directory by
+# `gunicorn app:server`). The app is imported once in the master and every
+# dataset is loaded and its page built there (datasets.preload) before the
+# workers are forked, so a new worker starts with the data, indexes and page
+# figures already in memory, shared copy-on-write with the master. Set
+# PRELOAD_DATASETS=0 to load datasets lazily in each worker instead.
+preload_app = True
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+
+
+def when_ready(server):
+    # the workers' metrics of a previous run (see metrics.py)
+    from metrics import clear_shared
+    clear_shared()
+    if os.environ.get("PRELOAD_DATASETS", "1") == "0":
+        return
+    from datasets import preload
+    preload()
+    # keep the preloaded objects out of the workers' garbage collections,
+    # which would otherwise touch (and copy) their pages
+    gc.freeze()
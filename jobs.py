@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import result_cache
+
+# Background jobs for heavy dashboard operations (select-all over a large
+# filter, Pareto recomputation). The request that starts a job only
+# submits it and returns; the job runs on a small thread pool of the worker
+# that received it (at most MAX_HEAVY_JOBS at a time, the rest queue), which
+# keeps the loaded dataset in memory and lets numpy work outside the GIL.
+# Status and progress are JSON files under JOB_DIR and results go through the
+# result cache, so the page can poll any worker. Cancelling writes a marker
+# that the job sees at its next report() and stops there.
+JOB_DIR = os.environ.get("JOB_DIR", os.path.join(".cache", "jobs"))
+MAX_HEAVY_JOBS = int(os.environ.get("MAX_HEAVY_JOBS", "2"))
+# operations over at least this many rows run in the background
+BACKGROUND_ROWS = int(os.environ.get("BACKGROUND_ROWS", "200000"))
+JOB_POLL_SECONDS = 0.5
+JOB_TTL_SECONDS = 3600
+
+log = logging.getLogger("graph.jobs")
+executor = ThreadPoolExecutor(max_workers=MAX_HEAVY_JOBS, thread_name_prefix="heavy-job")
+
+
+class Cancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, message=""):
+        self.id = job_id
+        self.message = message
+
+    def cancelled(self):
+        return os.path.exists(job_path(self.id, "cancel"))
+
+    def report(self, fraction, message=None):
+        # progress checkpoint; stops the job here once it was cancelled
+        if self.cancelled():
+            raise Cancelled(self.id)
+        if message is not None:
+            self.message = message
+        write_status(self.id, "running", fraction, self.message)
+
+
+def is_heavy(dataset):
+    return len(dataset.df) >= BACKGROUND_ROWS
+
+
+def job_path(job_id, suffix):
+    return os.path.join(JOB_DIR, f"{job_id}.{suffix}")
+
+
+def write_status(job_id, state, progress=0.0, message=""):
+    os.makedirs(JOB_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=JOB_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"state": state, "progress": progress, "message": message}, f)
+    os.replace(tmp, job_path(job_id, "json"))
+
+
+def status(job_id):
+    # {"state": queued|running|done|failed|cancelled, "progress", "message"}
+    try:
+        with open(job_path(job_id, "json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run(job, compute):
+    if job.cancelled():
+        write_status(job.id, "cancelled")
+        return
+    try:
+        job.report(0.0)
+        value = compute(job)
+        result_cache.put(job.id, value)
+        write_status(job.id, "done", 1.0)
+    except Cancelled:
+        write_status(job.id, "cancelled")
+    except Exception:
+        log.exception("background job %s failed", job.id)
+        write_status(job.id, "failed", message="failed")
+
+
+def submit(compute, message=""):
+    # Run compute(job) in the background and return the job id.
+    prune()
+    job = Job(uuid.uuid4().hex, message)
+    write_status(job.id, "queued", 0.0, message)
+    executor.submit(run, job, compute)
+    return job.id
+
+
+def result(job_id):
+    value = result_cache.get(job_id)
+    return None if value is result_cache.MISSING else value
+
+
+def cancel(job_id):
+    os.makedirs(JOB_DIR, exist_ok=True)
+    with open(job_path(job_id, "cancel"), "w"):
+        pass
+
+
+def forget(job_id):
+    for suffix in ("json", "cancel"):
+        try:
+            os.remove(job_path(job_id, suffix))
+        except OSError:
+            pass
+
+
+def prune():
+    # status files of pages that were closed before their job finished
+    try:
+        names = os.listdir(JOB_DIR)
+    except OSError:
+        return
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for name in names:
+        path = os.path.join(JOB_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import dash
+import dash._callback as dash_callback
+import flask
+
+# Request instrumentation. Every callback dispatch and page load is timed on
+# the Flask server and labelled with the callback function, the triggering
+# prop (ctx.triggered prop_id without the dataset) and the dataset. Response
+# serialization is timed separately by wrapping Dash's to_json; compute time
+# is the rest of the dispatch. Every worker process counts in memory and
+# writes its totals to METRICS_DIR/<pid>.json (after a request, at most
+# every METRICS_FLUSH_SECONDS, so another worker's last second may show up
+# one scrape late), and whichever worker answers a scrape of
+# METRICS_PATH sums the files of all workers, so the counters Prometheus
+# sees only grow whichever worker it reaches. gunicorn clears METRICS_DIR
+# when the server starts (see gunicorn.conf.py). Callbacks slower than
+# SLOW_CALLBACK_SECONDS are also logged (set it to 0 to turn the log off).
+METRICS_PATH = os.environ.get("METRICS_PATH", "/metrics")
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(".cache", "metrics"))
+METRICS_FLUSH_SECONDS = 1.0
+SLOW_CALLBACK_SECONDS = float(os.environ.get("SLOW_CALLBACK_SECONDS", "1.0"))
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+slow_log = logging.getLogger("graph.slow_callbacks")
+log = logging.getLogger("graph.metrics")
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            counts, total = self.series.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self.series[key] = (counts, total + value)
+
+    def snapshot(self):
+        with self.lock:
+            return [[list(map(list, key)), list(counts), total] for key, (counts, total) in self.series.items()]
+
+    def render(self, snapshots):
+        # snapshots: one snapshot() per worker, summed per label set
+        merged = {}
+        for snapshot in snapshots:
+            for key, counts, total in snapshot:
+                key = tuple(map(tuple, key))
+                merged_counts, merged_total = merged.get(key, ([0] * len(counts), 0.0))
+                merged[key] = ([a + b for a, b in zip(merged_counts, counts)], merged_total + total)
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(merged.items()):
+            labels = ",".join(f'{name}="{escape(value)}"' for name, value in key)
+            prefix = labels + "," if labels else ""
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {counts[-1]}")
+        return "\n".join(lines)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+CALLBACK_SECONDS = Histogram("dash_callback_seconds",
+                             "Callback dispatch time by phase (compute, serialize, total).", TIME_BUCKETS)
+CALLBACK_REQUEST_BYTES = Histogram("dash_callback_request_bytes", "Callback request body size.", SIZE_BUCKETS)
+CALLBACK_RESPONSE_BYTES = Histogram("dash_callback_response_bytes", "Callback response body size.", SIZE_BUCKETS)
+PAGE_SECONDS = Histogram("dash_page_load_seconds", "Page and layout request time.", TIME_BUCKETS)
+PAGE_RESPONSE_BYTES = Histogram("dash_page_response_bytes", "Page and layout response size.", SIZE_BUCKETS)
+METRICS = [CALLBACK_SECONDS, CALLBACK_REQUEST_BYTES, CALLBACK_RESPONSE_BYTES, PAGE_SECONDS, PAGE_RESPONSE_BYTES]
+
+
+def trigger_labels(body):
+    # "scatter-plot.selectedData" and "legofit" from a pattern-matching prop_id
+    changed = (body.get("changedPropIds") or ["initial"])[0]
+    component, _, prop = changed.rpartition(".")
+    if component.startswith("{"):
+        component_id = json.loads(component)
+        return f'{component_id.get("type")}.{prop}', component_id.get("dataset", "")
+    return changed, ""
+
+
+def callback_name(app, output):
+    entry = app.callback_map.get(output)
+    return getattr(entry["callback"], "__name__", output) if entry else output
+
+
+flush_lock = threading.Lock()
+last_flush = 0.0
+
+
+def flush(force=False):
+    # write this worker's totals for the other workers' scrapes
+    global last_flush
+    with flush_lock:
+        now = time.monotonic()
+        if not force and now - last_flush < METRICS_FLUSH_SECONDS:
+            return
+        last_flush = now
+        data = {metric.name: metric.snapshot() for metric in METRICS}
+        try:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=METRICS_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, os.path.join(METRICS_DIR, f"{os.getpid()}.json"))
+        except OSError:
+            log.exception("writing metrics to %s failed", METRICS_DIR)
+
+
+def clear_shared():
+    # drop the totals of a previous server run
+    if not os.path.isdir(METRICS_DIR):
+        return
+    for name in os.listdir(METRICS_DIR):
+        try:
+            os.remove(os.path.join(METRICS_DIR, name))
+        except OSError:
+            pass
+
+
+def worker_snapshots():
+    snapshots = []
+    for name in sorted(os.listdir(METRICS_DIR)) if os.path.isdir(METRICS_DIR) else []:
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, name), encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def render_metrics():
+    flush(force=True)
+    snapshots = worker_snapshots()
+    return "\n".join(metric.render([snapshot.get(metric.name, []) for snapshot in snapshots])
+                     for metric in METRICS) + "\n"
+
+
+def instrument(app):
+    server = app.server
+    page_paths = {page["path"] for page in dash.page_registry.values()} | {"/_dash-layout"}
+    to_json = dash_callback.to_json
+
+    def timed_to_json(value):
+        start = time.perf_counter()
+        try:
+            return to_json(value)
+        finally:
+            if flask.has_request_context():
+                flask.g.serialize_seconds = flask.g.get("serialize_seconds", 0.0) + time.perf_counter() - start
+
+    dash_callback.to_json = timed_to_json
+
+    @server.before_request
+    def start_timer():
+        flask.g.request_start = time.perf_counter()
+        flask.g.serialize_seconds = 0.0
+
+    @server.after_request
+    def record_request(response):
+        start = flask.g.get("request_start")
+        if start is None or response.direct_passthrough:
+            return response
+        elapsed = time.perf_counter() - start
+        path = flask.request.path
+        size = response.calculate_content_length() or 0
+        if path.endswith("/_dash-update-component"):
+            body = flask.request.get_json(silent=True) or {}
+            trigger, dataset = trigger_labels(body)
+            labels = {"callback": callback_name(app, body.get("output", "")), "trigger": trigger,
+                      "dataset": dataset, "status": str(response.status_code)}
+            serialize = flask.g.get("serialize_seconds", 0.0)
+            CALLBACK_SECONDS.observe({**labels, "phase": "total"}, elapsed)
+            CALLBACK_SECONDS.observe({**labels, "phase": "serialize"}, serialize)
+            CALLBACK_SECONDS.observe({**labels, "phase": "compute"}, elapsed - serialize)
+            CALLBACK_REQUEST_BYTES.observe(labels, flask.request.content_length or 0)
+            CALLBACK_RESPONSE_BYTES.observe(labels, size)
+            if SLOW_CALLBACK_SECONDS and elapsed >= SLOW_CALLBACK_SECONDS:
+                slow_log.warning("slow callback %s trigger=%s dataset=%s total=%.3fs serialize=%.3fs "
+                                 "request=%dB response=%dB", labels["callback"], trigger, dataset, elapsed,
+                                 serialize, flask.request.content_length or 0, size)
+        elif flask.request.method == "GET" and path in page_paths:
+            PAGE_SECONDS.observe({"path": path}, elapsed)
+            PAGE_RESPONSE_BYTES.observe({"path": path}, size)
+        else:
+            return response
+        flush()
+        return response
+
+    server.add_url_rule(METRICS_PATH, "metrics",
+                        lambda: flask.Response(render_metrics(), mimetype="text/plain; version=0.0.4"))
+    return app
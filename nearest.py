@@ -0,0 +1,170 @@
+from itertools import product
+
+import numpy as np
+
+# Nearest-design lookup over the envelope parameters. Parameter columns are
+# scaled to [0, 1] at load time and stored in a KD-tree with bucketed leaves:
+# a query walks a handful of splits in Python and scans the few leaves it
+# cannot rule out with one vectorized distance computation each. Matching a
+# whole set of designs within a tolerance (ParameterIndex.match) uses a grid
+# of tolerance-sized cells instead, so it is vectorized over the set.
+LEAF_SIZE = 32
+# targets matched per step; bounds the candidate pairs held at once
+MATCH_CHUNK = 65536
+
+
+class KDTree:
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        points = np.asarray(points, dtype=float)
+        self.size = len(points)
+        self.leaf_size = leaf_size
+        self.index = np.arange(self.size)
+        # nodes: (split dim or -1 for a leaf, split value, left, right, start, end)
+        self.nodes = []
+        self._build(points, 0, self.size)
+        # leaf points stored contiguously, so a leaf scan is a plain slice
+        self.points = points[self.index]
+
+    def _build(self, points, start, end):
+        node = len(self.nodes)
+        self.nodes.append(None)
+        idx = self.index[start:end]
+        spread = np.ptp(points[idx], axis=0) if end > start else np.zeros(points.shape[1])
+        if end - start <= self.leaf_size or not spread.any():
+            self.nodes[node] = (-1, 0.0, -1, -1, start, end)
+            return node
+        dim = int(np.argmax(spread))
+        mid = (end - start) // 2
+        order = np.argpartition(points[idx, dim], mid)
+        self.index[start:end] = idx[order]
+        split = points[self.index[start + mid], dim]
+        left = self._build(points, start, start + mid)
+        right = self._build(points, start + mid, end)
+        self.nodes[node] = (dim, split, left, right, start, end)
+        return node
+
+    def query(self, target, k=1):
+        # Positions (into the original points) of the k nearest points to
+        # `target`, closest first, and their Euclidean distances.
+        target = np.asarray(target, dtype=float)
+        k = min(k, self.size)
+        if k < 1:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        best_d = np.full(k, np.inf)
+        best_i = np.full(k, -1, dtype=np.intp)
+        worst = np.inf
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= worst:
+                continue
+            dim, split, left, right, start, end = self.nodes[node]
+            if dim < 0:
+                d = ((self.points[start:end] - target) ** 2).sum(axis=1)
+                cand_d = np.concatenate([best_d, d])
+                cand_i = np.concatenate([best_i, self.index[start:end]])
+                keep = np.argpartition(cand_d, k - 1)[:k]
+                best_d, best_i = cand_d[keep], cand_i[keep]
+                worst = best_d.max()
+                continue
+            diff = target[dim] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            # the far side is at least |diff| away along the split axis
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        order = np.argsort(best_d, kind="stable")
+        return best_i[order], np.sqrt(best_d[order])
+
+
+class ParameterIndex:
+    def __init__(self, frame, columns):
+        self.columns = list(columns)
+        values = np.column_stack([frame[col].to_numpy(dtype=float, na_value=np.nan) for col in self.columns]
+                                 or [np.empty((len(frame), 0))])
+        # designs with a missing parameter cannot be placed in the space
+        self.rows = np.flatnonzero(np.isfinite(values).all(axis=1))
+        values = values[self.rows]
+        self.low = values.min(axis=0) if len(values) else np.zeros(len(self.columns))
+        span = values.max(axis=0) - self.low if len(values) else np.ones(len(self.columns))
+        self.span = np.where(span > 0, span, 1.0)
+        self.tree = KDTree((values - self.low) / self.span)
+
+    def nearest(self, target, k=5):
+        # target: {column: value} or a sequence in column order. Returns the
+        # row positions of the k nearest designs and their distances in the
+        # normalized parameter space.
+        if not self.columns:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        if isinstance(target, dict):
+            target = [target[col] for col in self.columns]
+        target = (np.asarray(target, dtype=float) - self.low) / self.span
+        positions, distances = self.tree.query(target, k)
+        return self.rows[positions], distances
+
+    def match(self, targets, tolerance):
+        # For every row of `targets` (designs x parameters, in column order)
+        # the nearest design within `tolerance` in the normalized space, as
+        # row positions (-1 where none is close enough) and distances (inf
+        # there). A match can only lie in the 3**d grid cells around the
+        # target's cell, found by binary search over the occupied cells.
+        if tolerance <= 0:
+            raise ValueError("tolerance must be positive")
+        targets = (np.asarray(targets, dtype=float).reshape(-1, len(self.columns)) - self.low) / self.span
+        rows = np.full(len(targets), -1, dtype=np.intp)
+        distances = np.full(len(targets), np.inf)
+        valid = np.flatnonzero(np.isfinite(targets).all(axis=1))
+        points = self.tree.points
+        if not len(valid) or not len(points) or not self.columns:
+            return rows, distances
+        dims = len(self.columns)
+        # cells at least `tolerance` wide, wider for a tiny tolerance so the
+        # cell keys of every parameter together fit in an int64
+        limit = int(2 ** (62 / dims)) - 6
+        if limit < 1:
+            raise ValueError("too many parameters to match")
+        size = max(tolerance, 1 / limit)
+        # cells -2 .. top + 1 along every axis: the points' cells plus one on
+        # each side for the neighbours of (clipped) targets outside [0, 1]
+        top = int(1 / size) + 1
+        radix = top + 4
+        weights = radix ** np.arange(dims, dtype=np.int64)
+        keys = (np.floor(points / size).astype(np.int64) + 2) @ weights
+        order = np.argsort(keys, kind="stable")
+        # occupied cells: sorted keys, first point (in `order`) and count
+        cell_keys, cell_start, cell_count = np.unique(keys[order], return_index=True, return_counts=True)
+        offsets = [np.asarray(offset, dtype=np.int64) @ weights for offset in product((-1, 0, 1), repeat=dims)]
+        cells = np.clip(np.floor(targets[valid] / size), -1, top).astype(np.int64)
+        base = (cells + 2) @ weights
+        # targets in cell order, so every binary search runs over sorted needles
+        valid = valid[np.argsort(base, kind="stable")]
+        base = np.sort(base, kind="stable")
+        for start in range(0, len(valid), MATCH_CHUNK):
+            chunk = valid[start:start + MATCH_CHUNK]
+            chunk_targets = targets[chunk]
+            best = np.full(len(chunk), tolerance * tolerance)
+            best_point = np.full(len(chunk), -1, dtype=np.intp)
+            for offset in offsets:
+                needles = base[start:start + MATCH_CHUNK] + offset
+                cell = np.minimum(np.searchsorted(cell_keys, needles), len(cell_keys) - 1)
+                counts = np.where(cell_keys[cell] == needles, cell_count[cell], 0)
+                total = int(counts.sum())
+                if not total:
+                    continue
+                # every (target, point in the neighbour cell) pair
+                pair_target = np.repeat(np.arange(len(chunk)), counts)
+                pair_point = order[np.arange(total) - np.repeat(np.cumsum(counts) - counts - cell_start[cell], counts)]
+                d = ((points[pair_point] - chunk_targets[pair_target]) ** 2).sum(axis=1)
+                closer = d <= best[pair_target]
+                if not closer.any():
+                    continue
+                pair_target, pair_point, d = pair_target[closer], pair_point[closer], d[closer]
+                # closest pair per target, ties to the lower position
+                first = np.lexsort((pair_point, d, pair_target))
+                pair_target, pair_point, d = pair_target[first], pair_point[first], d[first]
+                head = np.flatnonzero(np.r_[True, pair_target[1:] != pair_target[:-1]])
+                best[pair_target[head]] = d[head]
+                best_point[pair_target[head]] = pair_point[head]
+            found = best_point >= 0
+            rows[chunk[found]] = self.rows[self.tree.index[best_point[found]]]
+            distances[chunk[found]] = np.sqrt(best[found])
+        return rows, distances
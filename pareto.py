@@ -0,0 +1,79 @@
+from functools import lru_cache
+
+import numpy as np
+
+from table_query import query_rows
+
+# Pareto-front extraction straight from the loaded simulation results.
+# Objectives are minimized (loads, errors); pass maximize=[...] to flip some.
+# Two objectives use an O(n log n) sort-and-sweep, more objectives use a
+# pruning filter that compares every remaining point against one front
+# candidate at a time, which is fast when the front is small relative to n.
+
+
+def front_2d(values):
+    order = np.lexsort((values[:, 1], values[:, 0]))
+    x = values[order, 0]
+    y = values[order, 1]
+    # after sorting by x, a point is on the front when its y beats every
+    # point before it
+    best_before = np.minimum.accumulate(np.concatenate([[np.inf], y[:-1]]))
+    on_front = y < best_before
+    # identical designs sort next to each other and share the first one's verdict
+    repeat = np.concatenate([[False], (x[1:] == x[:-1]) & (y[1:] == y[:-1])])
+    run = np.cumsum(~repeat) - 1
+    on_front = on_front[np.flatnonzero(~repeat)][run]
+    mask = np.zeros(len(values), dtype=bool)
+    mask[order[on_front]] = True
+    return mask
+
+
+def front_kd(values):
+    # visit points in order of their normalized objective sum, so the first
+    # candidates are likely on the front and prune the most points
+    span = np.ptp(values, axis=0)
+    span[span == 0] = 1.0
+    order = np.argsort(((values - values.min(axis=0)) / span).sum(axis=1), kind="stable")
+    remaining = order
+    candidates = values[order]
+    i = 0
+    while i < len(candidates):
+        # drop the points candidate i dominates; its duplicates stay
+        keep = ~(np.all(candidates >= candidates[i], axis=1) & np.any(candidates > candidates[i], axis=1))
+        remaining = remaining[keep]
+        candidates = candidates[keep]
+        i = int(np.count_nonzero(keep[:i])) + 1
+    mask = np.zeros(len(values), dtype=bool)
+    mask[remaining] = True
+    return mask
+
+
+def pareto_mask(values, maximize=None):
+    # Boolean mask of the non-dominated rows of an (n, k) objective array.
+    values = np.asarray(values, dtype=float)
+    mask = np.zeros(len(values), dtype=bool)
+    valid = np.flatnonzero(np.isfinite(values).all(axis=1))
+    if not len(valid):
+        return mask
+    points = values[valid]
+    if maximize:
+        points = np.where(np.asarray(maximize, dtype=bool), -points, points)
+    mask[valid] = front_2d(points) if points.shape[1] == 2 else front_kd(points)
+    return mask
+
+
+def front_of(dataset, objectives, rows, maximize=None):
+    # Row positions among `rows` on the Pareto front over `objectives`.
+    rows = np.asarray(rows, dtype=np.intp)
+    values = np.column_stack([
+        dataset.numeric[col][rows] for col in objectives
+    ])
+    return rows[pareto_mask(values, maximize)]
+
+
+@lru_cache(maxsize=128)
+def front_rows(dataset, objectives, filter_query="", maximize=None):
+    # Row positions of the Pareto front of `dataset` over `objectives`,
+    # computed on the rows matching the table filter. Cached per
+    # (dataset, objectives, filter).
+    return front_of(dataset, objectives, query_rows(dataset.df, filter_query), maximize)
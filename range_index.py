@@ -0,0 +1,80 @@
+import numpy as np
+
+# Columnar range index for parallel coordinates brushing. Every column is
+# argsorted once at load time, so a brush resolves with a binary search per
+# range and the result only grows with the number of matching rows.
+
+
+class ColumnRangeIndex:
+    def __init__(self, frame, columns):
+        self.size = len(frame)
+        self.values = {}
+        self.order = {}
+        self.sorted_values = {}
+        for col in columns:
+            values = frame[col].to_numpy(dtype=float, na_value=np.nan)
+            order = np.argsort(values, kind="stable")
+            self.values[col] = values
+            self.order[col] = order
+            self.sorted_values[col] = values[order]
+
+    def append(self, frame):
+        # Add the rows of `frame` (positions size.. in the dataset) by
+        # merging them into the sorted columns instead of re-sorting. The
+        # merged arrays are swapped in at the end, so concurrent queries see
+        # either the old or the new index.
+        positions = np.arange(self.size, self.size + len(frame))
+        values, order, sorted_values = {}, {}, {}
+        for col in self.order:
+            new_values = frame[col].to_numpy(dtype=float, na_value=np.nan)
+            new_order = np.argsort(new_values, kind="stable")
+            new_sorted = new_values[new_order]
+            at = np.searchsorted(self.sorted_values[col], new_sorted, side="right")
+            values[col] = np.concatenate([self.values[col], new_values])
+            order[col] = np.insert(self.order[col], at, positions[new_order])
+            sorted_values[col] = np.insert(self.sorted_values[col], at, new_sorted)
+        self.values, self.order, self.sorted_values = values, order, sorted_values
+        self.size += len(frame)
+
+    def slices(self, col, ranges):
+        sorted_values = self.sorted_values[col]
+        lows = np.searchsorted(sorted_values, [r[0] for r in ranges], side="left")
+        highs = np.searchsorted(sorted_values, [r[1] for r in ranges], side="right")
+        return list(zip(lows, highs))
+
+    def rows_in(self, col, ranges):
+        parts = [self.order[col][lo:hi] for lo, hi in self.slices(col, ranges) if hi > lo]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        # overlapping brushes on one axis must not duplicate rows
+        return np.unique(np.concatenate(parts)) if len(parts) > 1 else np.sort(parts[0])
+
+    def distinct_values(self, col, rows):
+        # sorted distinct values of col over the given rows, read off the
+        # sorted column instead of sorting the rows' values
+        marked = np.zeros(self.size, dtype=bool)
+        marked[rows] = True
+        values = self.sorted_values[col][marked[self.order[col]]]
+        values = values[~np.isnan(values)]
+        return values[np.r_[True, values[1:] != values[:-1]]] if len(values) else values
+
+    def query(self, constraints):
+        # constraints: {column: [[lo, hi], ...]}; rows inside any range of
+        # every constrained column, as sorted row positions.
+        constraints = {col: ranges for col, ranges in constraints.items() if ranges and col in self.order}
+        if not constraints:
+            return np.arange(self.size)
+        # start from the most selective column, then check the remaining
+        # columns on the candidate rows only
+        counts = {col: sum(hi - lo for lo, hi in self.slices(col, ranges)) for col, ranges in constraints.items()}
+        first = min(counts, key=counts.get)
+        rows = self.rows_in(first, constraints[first])
+        for col, ranges in constraints.items():
+            if col == first or not len(rows):
+                continue
+            values = self.values[col][rows]
+            keep = np.zeros(len(rows), dtype=bool)
+            for lo, hi in ranges:
+                keep |= (values >= lo) & (values <= hi)
+            rows = rows[keep]
+        return rows
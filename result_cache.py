@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+# Result cache shared by every worker process. Selections resolved from
+# brushes or filters and built figures are pickled into one file per entry
+# under RESULT_CACHE_DIR, keyed by dataset version plus a normalized
+# signature of the request, so any worker can answer a repeated exploration
+# without recomputing it. Reads touch the entry's mtime; after every
+# EVICT_INTERVAL_BYTES written by a process, the least recently used entries
+# are evicted once the directory exceeds RESULT_CACHE_BYTES. An entry that
+# cannot be read back is treated as a miss and removed.
+CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", os.path.join(".cache", "results"))
+MAX_BYTES = int(os.environ.get("RESULT_CACHE_BYTES", 256 * 1024 * 1024))
+EVICT_INTERVAL_BYTES = MAX_BYTES // 16
+# part of every key: bump it when a cached value changes shape or is
+# computed differently, so entries written by older code are never read
+CACHE_VERSION = 2
+MISSING = object()
+written = 0
+written_lock = threading.Lock()
+
+
+def signature(*parts):
+    # json with sorted keys, so {a, b} and {b, a} brushes share an entry
+    text = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def entry_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.pkl")
+
+
+def get(key):
+    path = entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        # mark as recently used for eviction
+        os.utime(path)
+    except FileNotFoundError:
+        return MISSING
+    except Exception:
+        # truncated, or pickled by code that no longer unpickles it
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return MISSING
+    return value
+
+
+def put(key, value):
+    global written
+    path = entry_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # write privately and rename into place, so readers never see a partial entry
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = f.tell()
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return
+    # walk the directory only every EVICT_INTERVAL_BYTES written
+    with written_lock:
+        written += size
+        if written < EVICT_INTERVAL_BYTES:
+            return
+        written = 0
+    evict()
+
+
+def evict(max_bytes=None):
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if not name.endswith(".pkl"):
+                continue
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+            total += stat.st_size
+    if total <= max_bytes:
+        return
+    # oldest first, down to 90% so every write does not evict again
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+        if total <= max_bytes * 0.9:
+            break
+
+
+def cached(namespace, dataset, params, compute):
+    # Value of compute() for (namespace, dataset version, params), shared
+    # across workers through the disk cache.
+    key = signature(CACHE_VERSION, namespace, dataset.name, dataset.version, params)
+    value = get(key)
+    if value is MISSING:
+        value = compute()
+        put(key, value)
+    return value
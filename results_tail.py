@@ -0,0 +1,73 @@
+import io
+import os
+import time
+
+import pandas as pd
+
+# Incremental reader for simulation results that are still being written:
+# either one CSV that the batch keeps appending to, or a directory that
+# receives one CSV per finished run. Each call to read_new() returns only the
+# rows that appeared since the previous call, or None when there are none
+# (also while the file or directory does not exist yet).
+SETTLE_SECONDS = 2.0
+
+
+class ResultsTail:
+    def __init__(self, path, **read_csv_kwargs):
+        self.path = path
+        self.read_csv_kwargs = read_csv_kwargs
+        self.offset = 0
+        self.columns = None
+        self.seen = set()
+
+    def read_new(self):
+        if os.path.isdir(self.path):
+            frames = [self.read_run(name) for name in self.finished_runs()]
+        else:
+            frames = [self.read_appended()]
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def read_appended(self):
+        if not os.path.isfile(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        # only complete lines; a half-written row is picked up next time
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return None
+        chunk = chunk[:end + 1]
+        if self.columns is None:
+            frame = pd.read_csv(io.BytesIO(chunk), **self.read_csv_kwargs)
+            self.columns = list(frame.columns)
+        else:
+            frame = pd.read_csv(io.BytesIO(chunk), header=None, names=self.columns, **self.read_csv_kwargs)
+        self.offset += len(chunk)
+        return frame if len(frame) else None
+
+    def finished_runs(self):
+        # files still being written (modified within SETTLE_SECONDS) wait
+        now = time.time()
+        names = []
+        for name in sorted(os.listdir(self.path)):
+            full = os.path.join(self.path, name)
+            if name in self.seen or not name.endswith(".csv") or not os.path.isfile(full):
+                continue
+            if now - os.path.getmtime(full) < SETTLE_SECONDS:
+                continue
+            names.append(name)
+        return names
+
+    def read_run(self, name):
+        self.seen.add(name)
+        try:
+            frame = pd.read_csv(os.path.join(self.path, name), **self.read_csv_kwargs)
+        except pd.errors.EmptyDataError:
+            return None
+        if self.columns is None:
+            self.columns = list(frame.columns)
+        return frame.reindex(columns=self.columns) if len(frame) else None
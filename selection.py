@@ -0,0 +1,187 @@
+import base64
+import json
+import re
+
+import numpy as np
+
+# Parallel coordinates constraint state. The figures are no longer sent back
+# and forth on every interaction; instead the active constraintrange of every
+# dimension is kept in a small dcc.Store keyed by dimension index, and only
+# the changed parts of the figures are sent to the browser as Patch updates.
+RESTYLE_KEY = re.compile(r"dimensions\[(\d+)\]\.constraintrange")
+
+
+def normalize_ranges(cons):
+    # plotly sends [lo, hi] for a single brush and [[lo, hi], ...] for several.
+    if not cons:
+        return None
+    if isinstance(cons[0], (list, tuple)):
+        return [list(r) for r in cons]
+    return [list(cons)]
+
+
+def constraints_from_restyle(restyle_data, constraints):
+    # Merge a parcoords restyleData delta into the stored constraints.
+    constraints = dict(constraints or {})
+    if not restyle_data or not isinstance(restyle_data, list):
+        return constraints
+    changes = restyle_data[0] or {}
+    for key, value in changes.items():
+        match = RESTYLE_KEY.fullmatch(key)
+        if match is None:
+            continue
+        # restyle values are wrapped in a per-trace list, or None when cleared
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], list):
+            value = value[0]
+        ranges = normalize_ranges(value)
+        if ranges:
+            constraints[match.group(1)] = ranges
+        else:
+            constraints.pop(match.group(1), None)
+    return constraints
+
+
+def restyled_dimensions(restyle_data):
+    if not restyle_data or not isinstance(restyle_data, list):
+        return set()
+    changes = restyle_data[0] or {}
+    return {int(m.group(1)) for m in map(RESTYLE_KEY.fullmatch, changes) if m}
+
+
+# A selection made outside the parallel plot is shown there through the
+# constraint ranges of every dimension. One range per selected value grows
+# with the selection, so the sorted distinct values of a dimension are merged
+# into at most MAX_SELECTION_RANGES ranges, split at the widest gaps between
+# them. Lines that fall in a gap inside a merged range show up as selected
+# too: past that many values the plot shows a superset of the selection.
+MAX_SELECTION_RANGES = 8
+
+
+def covering_ranges(distinct, limit=MAX_SELECTION_RANGES):
+    # distinct: sorted distinct values; [[lo, hi], ...] padded so the
+    # outermost values stay inside, or None for no values
+    distinct = np.asarray(distinct, dtype=float)
+    if not len(distinct):
+        return None
+    lows = highs = distinct
+    if len(distinct) > limit:
+        gaps = np.diff(distinct)
+        cuts = np.sort(np.argpartition(gaps, len(gaps) - limit + 1)[len(gaps) - limit + 1:])
+        lows = distinct[np.r_[0, cuts + 1]]
+        highs = distinct[np.r_[cuts, len(distinct) - 1]]
+    pad = lambda values: np.where(values != 0, np.abs(values) / 100000, 0.00001)
+    return np.column_stack([lows - pad(lows), highs + pad(highs)]).tolist()
+
+
+# Row highlighting. Rather than one filter_query per selected row, every
+# record carries a 0/1 selection flag and a single conditional style rule
+# matches it, so neither the callback nor the browser scales with the
+# selection size.
+SELECTED_FLAG = "_selected"
+SELECTED_ROW_STYLE = [{
+    "if": {"filter_query": f"{{{SELECTED_FLAG}}} = 1"},
+    "backgroundColor": "#F39C12",
+    "color": "white",
+}]
+
+
+def flag_selected(frame, selected_rows):
+    flags = np.zeros(len(frame), dtype=np.int8)
+    if len(selected_rows):
+        flags[np.asarray(selected_rows, dtype=np.intp)] = 1
+    return frame.assign(**{SELECTED_FLAG: flags})
+
+
+# Selection tokens. The selected row positions are kept in the page's
+# selection-store as one short URL-safe string rather than a list of ints:
+# "b" + a packed bitset (bit i set when row i is selected) for dense
+# selections, "d" + the gaps between the sorted rows as LEB128 varints for
+# sparse ones, whichever is shorter; "" is the empty selection. The same
+# token goes into shareable links. assets/linked_selection.js holds the
+# browser side of the codec.
+def urlsafe(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def from_urlsafe(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_varints(values):
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(len(values), dtype=np.intp)
+    for shift in range(7, 64, 7):
+        sizes += values >= np.uint64(1 << shift)
+    starts = np.cumsum(sizes) - sizes
+    out = np.zeros(int(sizes.sum()), dtype=np.uint8)
+    for k in range(int(sizes.max(initial=0))):
+        part = sizes > k
+        byte = (values[part] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        # high bit: more bytes of this value follow
+        out[starts[part] + k] = byte | np.where(sizes[part] > k + 1, 0x80, 0).astype(np.uint64)
+    return out.tobytes()
+
+
+def decode_varints(raw):
+    data = np.frombuffer(raw, dtype=np.uint8)
+    if not len(data) or data[-1] & 0x80:
+        raise ValueError("truncated varint")
+    last = data < 0x80
+    starts = np.flatnonzero(np.concatenate([[True], last[:-1]]))
+    shift = np.arange(len(data)) - np.repeat(starts, np.diff(np.append(starts, len(data))))
+    if shift.max() > 8:
+        raise ValueError("varint too long")
+    parts = (data & 0x7F).astype(np.int64) << (7 * shift)
+    return np.add.reduceat(parts, starts)
+
+
+def encode_selection(rows):
+    rows = np.unique(np.asarray(rows, dtype=np.int64))
+    if not len(rows):
+        return ""
+    gaps = encode_varints(np.diff(rows, prepend=-1) - 1)
+    if len(gaps) <= rows[-1] // 8 + 1:
+        return "d" + urlsafe(gaps)
+    bits = np.zeros(rows[-1] + 1, dtype=bool)
+    bits[rows] = True
+    return "b" + urlsafe(np.packbits(bits, bitorder="little").tobytes())
+
+
+def decode_selection(token, size=None):
+    # Sorted row positions of a token; rows past `size` are dropped. Raises
+    # ValueError for a malformed token (e.g. a mangled link).
+    if not token:
+        return np.empty(0, dtype=np.intp)
+    try:
+        raw = from_urlsafe(token[1:])
+    except (ValueError, TypeError):
+        raise ValueError(f"malformed selection token {token[:16]!r}")
+    if token[0] == "b":
+        rows = np.flatnonzero(np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little"))
+    elif token[0] == "d":
+        rows = np.cumsum(decode_varints(raw) + 1) - 1
+    else:
+        raise ValueError(f"unknown selection token {token[:16]!r}")
+    rows = rows.astype(np.intp)
+    return rows[rows < size] if size is not None else rows
+
+
+# Parallel coordinates brushes in a shareable link: the constraints store as
+# compact JSON in URL-safe base64.
+def encode_constraints(constraints):
+    if not constraints:
+        return ""
+    return urlsafe(json.dumps(constraints, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_constraints(token, dimensions):
+    if not token:
+        return {}
+    try:
+        constraints = json.loads(from_urlsafe(token))
+    except (ValueError, TypeError):
+        raise ValueError(f"malformed brush token {token[:16]!r}")
+    if not isinstance(constraints, dict):
+        raise ValueError(f"malformed brush token {token[:16]!r}")
+    return {key: normalize_ranges(ranges) for key, ranges in constraints.items()
+            if key.isdigit() and int(key) < dimensions and normalize_ranges(ranges)}
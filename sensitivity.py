@@ -0,0 +1,111 @@
+import numpy as np
+
+# Sensitivity of the simulated loads to the envelope parameters, for the
+# sensitivity panel. Every input and output column is reduced once at load
+# time to dense rank codes (its position among the column's distinct values)
+# and every input also to SENSITIVITY_BINS equal-frequency bins, so the
+# measures of any selection are bincounts and small matrix products over its
+# rows, with no sorting:
+# - spearman: rank correlation, with average ranks within the selection
+# - src: standardized regression coefficients of a linear fit of the output
+#   on all inputs (r2 tells how much of the variance that fit explains)
+# - first_order: variance of the binned conditional mean of the output over
+#   the variance of the output (correlation ratio)
+# Correlations come from one Gram matrix of the selected rows, and the
+# regression is solved on the inputs x inputs correlation matrix. Rows with a
+# missing input or output are left out; a column that is constant within the
+# selection gets zero for every measure.
+SENSITIVITY_BINS = 32
+MEASURES = {"spearman": "Spearman ρ", "src": "SRC", "first_order": "First-order index"}
+MIN_ROWS = 3
+
+
+class ParameterSensitivity:
+    def __init__(self, frame, inputs, outputs):
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        columns = self.inputs + self.outputs
+        self.size = len(frame)
+        values = np.empty((self.size, len(columns)))
+        for j, col in enumerate(columns):
+            values[:, j] = frame[col].to_numpy(dtype=float, na_value=np.nan)
+        self.complete = np.isfinite(values).all(axis=1)
+        complete = values[self.complete]
+        # centered on the full-data means, so the Gram matrix of a selection
+        # does not lose precision to large offsets (loads in kWh)
+        self.values = values - (complete.mean(axis=0) if len(complete) else 0.0)
+        self.codes = []
+        self.distinct = []
+        for j in range(len(columns)):
+            uniques, codes = np.unique(complete[:, j], return_inverse=True)
+            column_codes = np.zeros(self.size, dtype=np.int32)
+            column_codes[self.complete] = codes
+            self.codes.append(column_codes)
+            self.distinct.append(len(uniques))
+        # equal-frequency bins from the ranks over all complete rows
+        every = np.flatnonzero(self.complete)
+        ranks = self.ranks(every)
+        self.bins = []
+        for j in range(len(self.inputs)):
+            column_bins = np.zeros(self.size, dtype=np.intp)
+            column_bins[every] = np.minimum((ranks[:, j] - 1) * SENSITIVITY_BINS // max(len(every), 1),
+                                            SENSITIVITY_BINS - 1)
+            self.bins.append(column_bins)
+
+    def ranks(self, rows):
+        # average ranks (1-based, ties share their mean rank) of every column
+        # within the given rows
+        ranks = np.empty((len(rows), len(self.codes)))
+        for j, codes in enumerate(self.codes):
+            codes = codes[rows]
+            counts = np.bincount(codes, minlength=self.distinct[j])
+            ranks[:, j] = (np.cumsum(counts) - (counts - 1) / 2)[codes]
+        return ranks
+
+    def measures(self, rows=None):
+        # {measure: inputs x outputs array, "r2": per output, "rows": count},
+        # or None when the selection is too small; no rows means every row
+        rows = np.arange(self.size) if rows is None or not len(rows) else np.asarray(rows, dtype=np.intp)
+        rows = rows[self.complete[rows]]
+        if len(rows) < MIN_ROWS or not self.inputs or not self.outputs:
+            return None
+        p = len(self.inputs)
+        spearman = correlation(self.ranks(rows))[:p, p:]
+        values = self.values[rows]
+        corr = correlation(values)
+        src = np.linalg.lstsq(corr[:p, :p], corr[:p, p:], rcond=None)[0]
+        return {
+            "spearman": spearman,
+            "src": src,
+            "first_order": self.first_order(rows, values[:, p:]),
+            "r2": (corr[:p, p:] * src).sum(axis=0),
+            "rows": len(rows),
+        }
+
+    def first_order(self, rows, outputs):
+        # between-bin over total sum of squares, from per-bin counts and sums
+        n = len(rows)
+        totals = outputs.sum(axis=0)
+        spread = (outputs ** 2).sum(axis=0) - totals ** 2 / n
+        indices = np.zeros((len(self.inputs), outputs.shape[1]))
+        for i, bins in enumerate(self.bins):
+            bins = bins[rows]
+            counts = np.bincount(bins, minlength=SENSITIVITY_BINS)
+            occupied = counts > 0
+            for k in range(outputs.shape[1]):
+                sums = np.bincount(bins, weights=outputs[:, k], minlength=SENSITIVITY_BINS)
+                between = (sums[occupied] ** 2 / counts[occupied]).sum() - totals[k] ** 2 / n
+                indices[i, k] = between / spread[k] if spread[k] > 0 else 0.0
+        return indices
+
+
+def correlation(values):
+    # Pearson correlation matrix of the columns, with zeros for constant ones
+    mean = values.mean(axis=0)
+    gram = values.T @ values / len(values)
+    cov = gram - np.outer(mean, mean)
+    # a variance lost in rounding is a constant column
+    variance = np.diag(cov)
+    std = np.sqrt(np.where(variance > 1e-12 * np.diag(gram), variance, 0.0))
+    scale = np.outer(std, std)
+    return np.divide(cov, scale, out=np.zeros_like(cov), where=scale > 0)
@@ -0,0 +1,131 @@
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+from selection import flag_selected
+
+# Server-side filtering, sorting and paging for the DataTable. The table runs
+# with filter_action/sort_action/page_action="custom"; its filter_query is
+# translated into vectorized predicates over the DataFrame columns and only
+# the rows of the current page are sent to the browser. Any operator but
+# the blank checks may carry an i (case-insensitive) or s (case-sensitive,
+# the default) prefix, as in "icontains" or "s=".
+FILTER_PART = re.compile(
+    r"\s*\{(?P<col>[^}]+)\}\s*"
+    r"(?:(?P<blank>is blank|is not blank)"
+    r"|(?P<case>[is]?)(?P<op>>=|<=|!=|<|>|=|eq|ne|lt|le|gt|ge|contains|datestartswith)(?![a-z]))"
+    r"\s*(?P<value>.*?)\s*$"
+)
+OPERATORS = {
+    ">=": "ge", "<=": "le", "!=": "ne", "<": "lt", ">": "gt", "=": "eq",
+}
+# block size for filtering in a background job (see query_rows_in_chunks)
+QUERY_CHUNK_ROWS = 100000
+
+
+def parse_filter_query(filter_query):
+    parts = []
+    if not filter_query:
+        return parts
+    for part in filter_query.split(" && "):
+        match = FILTER_PART.match(part)
+        if match is None:
+            continue
+        op = match.group("blank") or OPERATORS.get(match.group("op"), match.group("op"))
+        value = match.group("value")
+        if value[:1] == value[-1:] and value[:1] in ("'", '"', "`") and len(value) > 1:
+            value = value[1:-1]
+        parts.append((match.group("col"), op, value, match.group("case") == "i"))
+    return parts
+
+
+def column_predicate(series, op, value, ignore_case=False):
+    if op == "is blank":
+        return series.isna().to_numpy()
+    if op == "is not blank":
+        return series.notna().to_numpy()
+    if ignore_case and not pd.api.types.is_numeric_dtype(series):
+        series = series.astype(str).str.lower()
+        value = value.lower()
+    if op in ("contains", "datestartswith"):
+        text = series.astype(str)
+        if op == "contains":
+            return text.str.contains(value, regex=False).to_numpy()
+        return text.str.startswith(value).to_numpy()
+
+    if pd.api.types.is_numeric_dtype(series):
+        try:
+            value = float(value)
+        except ValueError:
+            return np.zeros(len(series), dtype=bool)
+        values = series.to_numpy()
+    else:
+        values = series.astype(str).to_numpy()
+    if op == "eq":
+        return values == value
+    if op == "ne":
+        return values != value
+    if op == "lt":
+        return values < value
+    if op == "le":
+        return values <= value
+    if op == "gt":
+        return values > value
+    return values >= value
+
+
+def query_rows(frame, filter_query, rows=None):
+    # Row positions of `frame` (optionally restricted to `rows`) matching the
+    # DataTable filter query.
+    rows = np.arange(len(frame)) if rows is None else np.asarray(rows, dtype=np.intp)
+    for col, op, value, ignore_case in parse_filter_query(filter_query):
+        if col not in frame.columns or not len(rows):
+            continue
+        mask = column_predicate(frame[col].iloc[rows], op, value, ignore_case)
+        rows = rows[mask]
+    return rows
+
+
+def query_rows_in_chunks(frame, filter_query, report, chunk_rows=QUERY_CHUNK_ROWS):
+    # query_rows over blocks of rows, calling report(fraction) after each so
+    # a background job can show progress and stop between blocks.
+    parts = []
+    for start in range(0, len(frame), chunk_rows):
+        parts.append(query_rows(frame, filter_query, np.arange(start, min(start + chunk_rows, len(frame)))))
+        report(min(start + chunk_rows, len(frame)) / len(frame))
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+
+def sort_rows(frame, rows, sort_by):
+    for sort in reversed(sort_by or []):
+        col = sort.get("column_id")
+        if col not in frame.columns:
+            continue
+        values = frame[col].iloc[rows].reset_index(drop=True)
+        order = values.sort_values(ascending=sort.get("direction") != "desc", kind="stable").index
+        rows = rows[order.to_numpy()]
+    return rows
+
+
+def table_view(frame, filter_query, sort_by, rows=None):
+    return sort_rows(frame, query_rows(frame, filter_query, rows), sort_by)
+
+
+def page_count(view, page_size):
+    return max(1, math.ceil(len(view) / page_size))
+
+
+def first_page_of(view, rows, page_size):
+    # First page of the view that shows any of `rows`.
+    positions = np.flatnonzero(np.isin(view, np.asarray(rows, dtype=np.intp)))
+    return int(positions[0]) // page_size if len(positions) else 0
+
+
+def page_records(frame, view, page_current, page_size, selected):
+    page_current = min(page_current or 0, page_count(view, page_size) - 1)
+    page_rows = view[page_current * page_size:(page_current + 1) * page_size]
+    page_selected = np.flatnonzero(np.isin(page_rows, np.asarray(selected if selected is not None else [], dtype=np.intp)))
+    records = flag_selected(frame.iloc[page_rows], page_selected).assign(id=page_rows)
+    return records.to_dict("records"), page_selected.tolist()
@@ -0,0 +1,90 @@
+import gzip
+import json
+
+import flask
+import numpy as np
+import plotly.io as pio
+from _plotly_utils.utils import to_typed_array_spec
+
+# Compact figure payloads. Plotly sends numpy arrays in figures as base64
+# typed arrays ({dtype, bdata}); compact_array() first picks the smallest
+# dtype that keeps the values: float64 becomes float32 when no value moves
+# by more than FLOAT32_RTOL (relative), and whole numbers become the
+# smallest integer type holding their range. compact_figure() does this for
+# every array in the traces of a built figure. Arrays assigned through a
+# Patch are sent as plain JSON lists, so callbacks wrap them in
+# typed_array() instead. Layout and callback responses are also gzipped for
+# browsers that accept it.
+FLOAT32_RTOL = 1e-6
+INTEGER_TYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32)
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
+
+def compact_array(values):
+    values = np.asarray(values)
+    if not values.size or values.dtype.kind not in "iuf":
+        return values
+    if values.dtype.kind == "f":
+        finite = np.isfinite(values)
+        if not finite.all() or not np.array_equal(values, np.round(values)):
+            # fractions, NaN and inf stay floating point
+            with np.errstate(over="ignore"):
+                single = values.astype(np.float32)
+            close = np.abs(single[finite] - values[finite]) <= FLOAT32_RTOL * np.abs(values[finite])
+            return single if close.all() else values
+    low, high = values.min(), values.max()
+    for dtype in INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+def typed_array(values):
+    # {dtype, bdata, shape} spec for assigning an array through a Patch
+    return to_typed_array_spec(compact_array(values))
+
+
+def array_paths(obj, path=()):
+    if isinstance(obj, np.ndarray):
+        yield path, obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from array_paths(value, path + (key,))
+    elif isinstance(obj, (list, tuple)):
+        for i, value in enumerate(obj):
+            yield from array_paths(value, path + (i,))
+
+
+def compact_figure(fig):
+    for trace in fig.data:
+        for path, values in list(array_paths(trace.to_plotly_json())):
+            trace[path] = compact_array(values)
+    return fig
+
+
+def figure_json(fig):
+    # A built figure as plain JSON data (typed arrays already base64), for
+    # layouts that are built once and served many times.
+    return json.loads(pio.to_json(fig, validate=False))
+
+
+def compress_responses(app):
+    server = app.server
+
+    @server.after_request
+    def gzip_response(response):
+        if (response.direct_passthrough or response.status_code != 200 or response.mimetype != "application/json"
+                or "Content-Encoding" in response.headers
+                or "gzip" not in flask.request.headers.get("Accept-Encoding", "")):
+            return response
+        data = response.get_data()
+        if len(data) < GZIP_MIN_BYTES:
+            return response
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+        response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+        return response
+
+    return app
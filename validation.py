@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Validation of an optimizer's Pareto set against a simulation sweep. Every
+# Pareto design is matched to the closest simulated design in the normalized
+# parameter space of the sweep (ParameterIndex.match), if one lies within
+# VALIDATION_TOLERANCE, and the simulated loads are put next to the ones the
+# optimizer predicted (the source's own load columns) with their absolute
+# percentage error. The sweep is coarse, so a match is usually a neighbour
+# rather than the same design: Match_distance stays in the table to judge
+# how close it is, and designs with no simulation within the tolerance get
+# NaN. The joined columns are cached in the result cache per version of both
+# datasets (see Dataset.load).
+VALIDATION_TOLERANCE = float(os.environ.get("VALIDATION_TOLERANCE", "0.25"))
+MATCH_DISTANCE = "Match_distance"
+# load: (simulated, error) columns
+VALIDATION_COLUMNS = {
+    "cooling": ("Simulation_TIC (kWh)", "MAPE_cooling"),
+    "heating": ("Simulation_TIH (kWh)", "MAPE_heating"),
+}
+
+
+class ValidationJoin:
+    def __init__(self, simulation, parameters, loads, scale=None, tolerance=None):
+        # simulation: name of the simulated dataset
+        # parameters: {column: simulation column}
+        # loads: {"cooling"/"heating": (column, simulation column)}
+        # scale: {column: factor} bringing a parameter to the simulation's unit
+        self.simulation = simulation
+        self.parameters = dict(parameters)
+        self.loads = dict(loads)
+        self.scale = dict(scale or {})
+        self.tolerance = VALIDATION_TOLERANCE if tolerance is None else tolerance
+
+    def params(self, simulation):
+        # everything the joined columns depend on besides the Pareto source
+        return {"simulation": simulation.version, "parameters": self.parameters, "loads": self.loads,
+                "scale": self.scale, "tolerance": self.tolerance, "columns": VALIDATION_COLUMNS}
+
+    def columns(self, frame, simulation):
+        index = simulation.parameter_index
+        own = {sim_col: col for col, sim_col in self.parameters.items()}
+        targets = np.column_stack([
+            frame[own[sim_col]].to_numpy(dtype=float, na_value=np.nan) * self.scale.get(own[sim_col], 1.0)
+            for sim_col in index.columns
+        ])
+        rows, distances = index.match(targets, self.tolerance)
+        matched = rows >= 0
+        joined = {}
+        for load, (simulated_col, error_col) in VALIDATION_COLUMNS.items():
+            if load not in self.loads:
+                continue
+            col, sim_col = self.loads[load]
+            predicted = frame[col].to_numpy(dtype=float, na_value=np.nan)
+            simulated = np.full(len(frame), np.nan)
+            simulated[matched] = simulation.df[sim_col].to_numpy(dtype=float, na_value=np.nan)[rows[matched]]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                error = np.abs(predicted - simulated) / np.abs(simulated) * 100
+            joined[simulated_col] = simulated
+            joined[error_col] = np.where(np.isfinite(error), error, np.nan)
+        joined[MATCH_DISTANCE] = np.where(matched, distances, np.nan)
+        return pd.DataFrame(joined, index=frame.index)